@@ -0,0 +1,5 @@
+# Load .env once, before any module reads its settings. Variables already set
+# in the environment win, so deployments that inject config skip the file.
+from dotenv import load_dotenv
+
+load_dotenv()
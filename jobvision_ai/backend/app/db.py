@@ -1,16 +1,106 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+import asyncio
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
+import time
+from app.utils.metrics import DB_POOL_CHECKOUT_WAIT, register_pool
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional read replica for read-only lookups; writes always go to DATABASE_URL
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Recycle connections older than this many seconds (-1 disables)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Connections opened per async engine during startup, before the worker accepts requests
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", 1))
+
+# Async drivers for each sync URL scheme we support
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync DATABASE_URL onto its async driver.
+    URLs that already name an async driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def timed_pool(base, label: str):
+    """
+    A pool class that reports how long each checkout waited for a connection.
+    """
+    class TimedPool(base):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                DB_POOL_CHECKOUT_WAIT.labels(pool=label).observe(time.perf_counter() - start)
 
-engine = create_engine(DATABASE_URL)
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+def engine_options(url: str, label: str, is_async: bool) -> dict:
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite keeps one connection per thread; queue settings don't apply
+        return options
+    options.update(
+        poolclass=timed_pool(AsyncAdaptedQueuePool if is_async else QueuePool, label),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, "primary_sync", False))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, "primary", True))
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+if READ_REPLICA_URL:
+    read_async_url = to_async_url(READ_REPLICA_URL)
+    read_async_engine = create_async_engine(read_async_url, **engine_options(read_async_url, "replica", True))
+    AsyncReadSessionLocal = async_sessionmaker(
+        bind=read_async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    read_async_engine = async_engine
+    AsyncReadSessionLocal = AsyncSessionLocal
+
+register_pool("primary_sync", engine)
+register_pool("primary", async_engine.sync_engine)
+if READ_REPLICA_URL:
+    register_pool("replica", read_async_engine.sync_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -18,4 +108,28 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db():
+    """
+    Session for read-only lookups. Uses the replica when READ_REPLICA_URL is
+    set, so callers must tolerate replication lag and never write through it.
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+async def select_one(target):
+    async with target.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def warm_up(connections: int = DB_WARMUP_CONNECTIONS):
+    """
+    Open pool connections up front so the first requests don't pay for the
+    TCP/TLS handshake and authentication. Called from the app lifespan.
+    """
+    engines = [async_engine] if read_async_engine is async_engine else [async_engine, read_async_engine]
+    await asyncio.gather(*(select_one(target) for target in engines for _ in range(connections)))
@@ -1,8 +1,79 @@
+import asyncio
+from contextlib import asynccontextmanager
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.db import async_engine, engine, read_async_engine, warm_up
+from app.middleware.metrics import MetricsMiddleware
 from app.routes import auth  # auth.py router
+from app.routes import metrics
+from app.routes import admin
+from app.routes import health
+from app.routes import jobs
+from app.mongo import MONGO_URL, close_mongo, ensure_indexes
+from app.services.email_outbox import outbox_worker, purge_forever
+from app.services.password_service import password_hasher
+from app.services.rate_limiter import rate_limiter, sweep_buckets_forever
+from app.services.token_service import refresh_tokens
+from app.services.verification_codes import sweep_forever
+from app.services.user_cache import token_cache, user_cache
+from app.utils.cache import SharedStateCacheBackend
+from app.utils.metrics import instrument_engine, mark_worker_exited, stats_collector
+from app.utils.rate_limit import SharedStateRateLimitStore
+from app.utils.revocation import SharedStateRevocationStore
+from app.utils.shared_state import open_shared_state
 
-app = FastAPI(title="JobVision AI Backend")
+OUTBOX_WORKER_ENABLED = os.getenv("OUTBOX_WORKER_ENABLED", "true").lower() == "true"
+# Share rate limits, refresh-token revocation and the profile cache between
+# worker processes (see app/utils/shared_state.py); unset keeps them per process
+SHARED_STATE_URL = os.getenv("SHARED_STATE_URL")
+
+shared_state = open_shared_state(SHARED_STATE_URL) if SHARED_STATE_URL else None
+if shared_state is not None:
+    user_cache.backend = SharedStateCacheBackend(shared_state)
+    refresh_tokens.store = SharedStateRevocationStore(shared_state)
+    rate_limiter.store = SharedStateRateLimitStore(shared_state)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy, I/O-bound setup happens here rather than at import time.
+    # uvicorn only accepts connections once this startup half has finished
+    try:
+        await warm_up()
+    except Exception as e:
+        print(f"❌ Database warm-up failed: {e}")
+    if MONGO_URL:
+        try:
+            await ensure_indexes()
+        except Exception as e:
+            print(f"❌ Mongo index setup failed: {e}")
+    if OUTBOX_WORKER_ENABLED:
+        await outbox_worker.start()
+    sweeper = asyncio.create_task(sweep_forever())
+    bucket_sweeper = asyncio.create_task(sweep_buckets_forever())
+    outbox_purger = asyncio.create_task(purge_forever())
+    hasher_warm_up = asyncio.create_task(password_hasher.warm_up())
+    yield
+    # Runs after uvicorn has closed the listening socket and in-flight
+    # requests have finished (or GRACEFUL_TIMEOUT ran out)
+    sweeper.cancel()
+    bucket_sweeper.cancel()
+    outbox_purger.cancel()
+    hasher_warm_up.cancel()
+    await outbox_worker.stop()
+    password_hasher.shutdown()
+    if shared_state is not None:
+        await shared_state.close()
+    close_mongo()
+    # Close this worker's pooled connections rather than leaving them for the
+    # database to time out
+    await async_engine.dispose()
+    if read_async_engine is not async_engine:
+        await read_async_engine.dispose()
+    engine.dispose()
+    mark_worker_exited()
+
+app = FastAPI(title="JobVision AI Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,8 +83,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
+app.include_router(health.router)
+app.include_router(jobs.router)
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+instrument_engine(read_async_engine.sync_engine)
+stats_collector.add("outbox", outbox_worker.stats)
+stats_collector.add("password_hasher", password_hasher.stats)
+stats_collector.add("rate_limiter", rate_limiter.stats)
+stats_collector.add("refresh_tokens", refresh_tokens.stats)
+stats_collector.add("token_cache", token_cache.stats)
+stats_collector.add("user_cache", user_cache.stats)
 
 @app.get("/")
 async def root():
     return {"message": "API is running"}
+
+@app.get("/outbox/stats")
+async def outbox_stats():
+    return outbox_worker.stats()
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"token_cache": token_cache.stats(), "user_cache": user_cache.stats()}
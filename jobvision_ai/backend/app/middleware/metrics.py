@@ -0,0 +1,87 @@
+"""
+Per-request timing middleware.
+
+Records latency, status codes and in-flight count per route template, and the
+DB time/queries the request's session issued. When PROFILER_ENABLED is set,
+requests sent with an `X-Profile` header and a valid `X-Admin-Key` are
+stack-sampled and, if slower than PROFILER_SLOW_MS, dumped as a folded profile
+into PROFILER_DIR.
+"""
+import os
+import time
+
+from app.routes.admin import is_admin_key
+from app.utils.metrics import (
+    DB_REQUEST_QUERIES,
+    DB_REQUEST_TIME,
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    request_db_stats,
+)
+from app.utils.profiler import StackSampler
+
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+PROFILER_SLOW_MS = float(os.getenv("PROFILER_SLOW_MS", 200))
+PROFILER_DIR = os.getenv("PROFILER_DIR", "profiles")
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", 5))
+
+
+def wants_profile(scope) -> bool:
+    # Sampling costs a thread and a file per request, so only admins get it
+    headers = dict(scope["headers"])
+    admin_key = headers.get(b"x-admin-key")
+    return b"x-profile" in headers and is_admin_key(admin_key.decode("latin-1") if admin_key else None)
+
+
+def route_label(scope) -> str:
+    # Use the matched template (/auth/user/{user_id}) to keep label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        db_stats = {"queries": 0, "seconds": 0.0}
+        token = request_db_stats.set(db_stats)
+
+        sampler = None
+        if PROFILER_ENABLED and wants_profile(scope):
+            sampler = StackSampler(interval=PROFILER_INTERVAL_MS / 1000)
+            sampler.start()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            request_db_stats.reset(token)
+
+            method = scope["method"]
+            route = route_label(scope)
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status)).inc()
+            HTTP_LATENCY.labels(method=method, route=route).observe(elapsed)
+            DB_REQUEST_TIME.labels(route=route).observe(db_stats["seconds"])
+            DB_REQUEST_QUERIES.labels(route=route).observe(db_stats["queries"])
+
+            if sampler is not None:
+                sampler.stop()
+                if elapsed * 1000 >= PROFILER_SLOW_MS:
+                    path = sampler.dump(PROFILER_DIR, f"{method}-{route}")
+                    print(f"🔥 Profile for {method} {scope['path']} ({elapsed * 1000:.1f} ms): {path}")
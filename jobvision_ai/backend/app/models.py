@@ -1,6 +1,12 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, Text
+from datetime import datetime, timezone
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from app.db import Base
+from app.utils.normalize import normalize_email
+
+def utcnow():
+    return datetime.now(timezone.utc)
 
 class User(Base):
     __tablename__ = "users"
@@ -8,8 +14,53 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
+    # Every lookup filters on this; see app.utils.normalize.normalize_email
+    email_normalized = Column(String, unique=True, index=True, nullable=True)
     password = Column(String, nullable=False)
     is_verified = Column(Boolean, default=False)
-    verification_code = Column(String, nullable=True)
+    # Set client-side too so SQLite stores the same format the keyset cursor binds
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    verified_at = Column(DateTime(timezone=True), nullable=True)
+    # HTTP validators for the public profile (ETag / Last-Modified). Every
+    # write that changes a profile field must bump both.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), default=utcnow, nullable=True)
+
+    __table_args__ = (
+        # Keyset pagination for the admin listing walks this index newest-first
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
+    @validates("email")
+    def _set_email_normalized(self, key, email):
+        self.email_normalized = normalize_email(email)
+        return email
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending | sent | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    verified_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+# Pending email verification codes, one per address. Kept out of `users` so
+# issuing and expiring codes never rewrites user rows.
+class VerificationCode(Base):
+    __tablename__ = "verification_codes"
+
+    email_normalized = Column(String, primary_key=True)
+    code_hash = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
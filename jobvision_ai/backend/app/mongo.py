@@ -0,0 +1,89 @@
+"""
+MongoDB connection for the jobs subsystem.
+
+One motor client per process: the client owns the connection pool, so every
+request shares it instead of connecting on its own. motor is imported on
+first use, keeping it off the import path of workers that never touch jobs.
+Without MONGO_URL the jobs endpoints answer 503.
+"""
+import asyncio
+import os
+
+from fastapi import HTTPException
+
+MONGO_URL = os.getenv("MONGO_URL")
+MONGO_DB = os.getenv("MONGO_DB", "jobvision")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+
+JOBS_COLLECTION = "jobs"
+PROFILES_COLLECTION = "applicant_profiles"
+
+_client = None
+
+
+def motor_client():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient(
+        MONGO_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        tz_aware=True,
+    )
+
+
+# Replaceable like outbox_worker.transport_factory; benchmarks/ swap in an
+# in-process stand-in when no mongod is available
+client_factory = motor_client
+
+
+def get_mongo_client():
+    global _client
+    if _client is None:
+        if not MONGO_URL:
+            raise HTTPException(status_code=503, detail="Job search is not configured")
+        _client = client_factory()
+    return _client
+
+
+def mongo_db():
+    return get_mongo_client()[MONGO_DB]
+
+
+async def get_mongo_db():
+    """Dependency for the jobs routes (async, so FastAPI doesn't use a thread)."""
+    return mongo_db()
+
+
+async def ensure_indexes(db=None):
+    """
+    Create the indexes every jobs query relies on. Idempotent; called from
+    the app lifespan.
+    """
+    db = db if db is not None else mongo_db()
+    jobs = db[JOBS_COLLECTION]
+    await asyncio.gather(
+        # Newest-first listing and its keyset cursor
+        jobs.create_index([("posted_at", -1), ("_id", -1)], name="posted_at_id"),
+        # Multikey: candidate retrieval for matching and ?skill= filters
+        jobs.create_index([("skills", 1), ("posted_at", -1), ("_id", -1)], name="skills_posted_at_id"),
+        jobs.create_index([("company", 1), ("posted_at", -1), ("_id", -1)], name="company_posted_at_id"),
+    )
+
+
+async def ping_mongo() -> bool:
+    try:
+        await get_mongo_client().admin.command("ping")
+        return True
+    except Exception:
+        return False
+
+
+def close_mongo():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
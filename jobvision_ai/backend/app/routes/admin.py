@@ -0,0 +1,51 @@
+import hmac
+import os
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_read_db
+from app.schemas import UserPage
+from app.services.admin_service import export_users, list_users
+
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+def is_admin_key(value: Optional[str]) -> bool:
+    # Without ADMIN_API_KEY configured the admin API is disabled entirely
+    return bool(ADMIN_API_KEY and value and hmac.compare_digest(value, ADMIN_API_KEY))
+
+def require_admin(x_admin_key: Optional[str] = Header(default=None)):
+    if not is_admin_key(x_admin_key):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+@router.get("/users", response_model=UserPage)
+async def admin_list_users(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    is_verified: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Newest users first. Pass `next_cursor` from a response as `cursor` to get
+    the following page. Returns: {users: [...], next_cursor}
+    """
+    return await list_users(db, limit, cursor, is_verified, created_from, created_to)
+
+@router.get("/users/export")
+async def admin_export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    is_verified: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_users(format, is_verified, created_from, created_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
@@ -1,12 +1,34 @@
-from fastapi import APIRouter, HTTPException, Response, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Response, Request
+from typing import List
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, get_read_db
 from app.services.auth_service import (
     register_user,
     login_user,
+    logout_user,
+    refresh_session,
     verify_user_email,
+    resend_verification_code,
     get_current_user,
     fetch_user_by_email,  # new import
+    fetch_user_by_id,
+    fetch_users_by_ids,
+    fetch_users_by_emails,
 )
+from app.schemas import (
+    LoginResponse,
+    MessageResponse,
+    UserProfile,
+    UserResponse,
+    UsersByEmailResponse,
+    UsersByIdResponse,
+)
+from app.services.rate_limiter import rate_limiter
+from app.services.user_loader import UserLoaders, get_user_loaders
+from app.utils.http_cache import conditional_profile_response
+
+MAX_BATCH_LOOKUP = 500
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -29,54 +51,108 @@ class VerifyRequest(BaseModel):
 class EmailRequest(BaseModel):
     email: str
 
+class BatchIdsRequest(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_LOOKUP)
+
+class BatchEmailsRequest(BaseModel):
+    emails: List[str] = Field(min_length=1, max_length=MAX_BATCH_LOOKUP)
+
 # ----------------------
 # Routes
 # ----------------------
-@router.post("/register")
-async def register(req: RegisterRequest):
-    res = await register_user(req.email, req.name, req.password)
+@router.post("/register", response_model=MessageResponse)
+async def register(req: RegisterRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    await rate_limiter.check("register", request, req.email)
+    res = await register_user(req.email, req.name, req.password, db)
     if "error" in res:
         raise HTTPException(status_code=400, detail=res["error"])
     return res
 
-@router.post("/login")
-async def login(req: LoginRequest, response: Response):
-    res = await login_user(req.email, req.password, response)
+@router.post("/login", response_model=LoginResponse)
+async def login(req: LoginRequest, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    await rate_limiter.check("login", request, req.email)
+    res = await login_user(req.email, req.password, response, db)
     if "error" in res:
         raise HTTPException(status_code=400, detail=res["error"])
     return res
 
-@router.post("/verify")
-async def verify(req: VerifyRequest):
-    res = await verify_user_email(req.email, req.code)
+@router.post("/refresh", response_model=MessageResponse)
+async def refresh(request: Request, response: Response):
+    return await refresh_session(request, response)
+
+@router.post("/logout", response_model=MessageResponse)
+async def logout(request: Request, response: Response):
+    return await logout_user(request, response)
+
+@router.post("/verify", response_model=MessageResponse)
+async def verify(req: VerifyRequest, db: AsyncSession = Depends(get_async_db)):
+    res = await verify_user_email(req.email, req.code, db)
     if "error" in res:
         raise HTTPException(status_code=400, detail=res["error"])
     return res
 
-@router.get("/me")
-async def me(request: Request):
+@router.post("/resend-verification", response_model=MessageResponse)
+async def resend_verification(req: EmailRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    await rate_limiter.check("resend", request, req.email)
+    res = await resend_verification_code(req.email, db)
+    if "error" in res:
+        raise HTTPException(status_code=400, detail=res["error"])
+    return res
+
+@router.get("/me", response_model=UserResponse)
+async def me(request: Request, db: AsyncSession = Depends(get_read_db)):
     try:
-        user = await get_current_user(request)
-        return user
+        user = await get_current_user(request, db)
+        # Per-cookie response: shared caches must not hand it to anyone else
+        return conditional_profile_response(request, user["user"], user, vary="Cookie")
     except HTTPException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 # ----------------------
 # New endpoint: fetch user by email
 # ----------------------
-@router.post("/fetch-by-email")
-async def fetch_by_email(req: EmailRequest):
+@router.post("/fetch-by-email", response_model=UserProfile)
+async def fetch_by_email(req: EmailRequest, request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Fetch full user record by email.
     Returns: {id, name, email, is_verified, created_at, ...}
+    Send the last ETag as If-None-Match to get a 304 when nothing changed.
     """
     try:
-        user = await fetch_user_by_email(req.email)
-        return user
+        user = await fetch_user_by_email(req.email, db)
+        return conditional_profile_response(request, user)
     except HTTPException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 
-@router.get("/user/{user_id}")
-async def get_user_by_id(user_id: str):
-    return await fetch_user_by_id(user_id)
+@router.get("/user/{user_id}", response_model=UserProfile)
+async def get_user_by_id(user_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    user = await fetch_user_by_id(user_id, db)
+    return conditional_profile_response(request, user)
+
+
+async def current_user_id(request: Request, db: AsyncSession = Depends(get_read_db)) -> int:
+    return (await get_current_user(request, db))["user"]["id"]
+
+async def batch_lookup_allowed(request: Request, user_id: int = Depends(current_user_id)):
+    await rate_limiter.check("batch_lookup", request, user_id=user_id)
+
+
+# ----------------------
+# Batch lookups: one IN query per call, results in request order. They hand
+# out up to MAX_BATCH_LOOKUP names and emails at once, so callers must be
+# logged in and are throttled per user and per IP
+# ----------------------
+@router.post("/users/batch", response_model=UsersByIdResponse, dependencies=[Depends(batch_lookup_allowed)])
+async def get_users_by_ids(req: BatchIdsRequest, loaders: UserLoaders = Depends(get_user_loaders)):
+    """
+    Returns: {users: [profile | null, ...], missing: [id, ...]}
+    """
+    return await fetch_users_by_ids(req.ids, loaders)
+
+@router.post("/fetch-by-email/batch", response_model=UsersByEmailResponse, dependencies=[Depends(batch_lookup_allowed)])
+async def fetch_by_emails(req: BatchEmailsRequest, loaders: UserLoaders = Depends(get_user_loaders)):
+    """
+    Returns: {users: [profile | null, ...], missing: [email, ...]}
+    """
+    return await fetch_users_by_emails(req.emails, loaders)
@@ -0,0 +1,48 @@
+import asyncio
+import os
+from fastapi import APIRouter, Response
+from app.db import async_engine, select_one
+from app.mongo import MONGO_URL, ping_mongo
+
+HEALTH_DB_TIMEOUT = float(os.getenv("HEALTH_DB_TIMEOUT", 2))
+# Job search is optional: a Mongo outage fails /jobs, not login, unless asked
+READY_REQUIRES_MONGO = os.getenv("READY_REQUIRES_MONGO", "false").lower() == "true"
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+async def ping_database() -> bool:
+    try:
+        await asyncio.wait_for(select_one(async_engine), HEALTH_DB_TIMEOUT)
+        return True
+    except Exception:
+        return False
+
+async def ping_jobs_store() -> bool:
+    try:
+        return await asyncio.wait_for(ping_mongo(), HEALTH_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        return False
+
+@router.get("/live", include_in_schema=False)
+async def live():
+    """The process is up and serving; never touches dependencies."""
+    return {"status": "ok"}
+
+@router.get("/ready", include_in_schema=False)
+async def ready(response: Response):
+    """
+    Ready while the database answers. Mongo is reported in `checks` when
+    configured but only fails readiness with READY_REQUIRES_MONGO. uvicorn
+    serves nothing before lifespan startup completes and stops accepting
+    before shutdown runs, so startup and draining need no flag here; drain a
+    worker by taking it out of rotation before sending SIGTERM.
+    """
+    checks = {"database": await ping_database()}
+    required = ["database"]
+    if MONGO_URL:
+        checks["mongo"] = await ping_jobs_store()
+        if READY_REQUIRES_MONGO:
+            required.append("mongo")
+    if not all(checks[name] for name in required):
+        response.status_code = 503
+    return {"status": "ok" if response.status_code != 503 else "unavailable", "checks": checks}
@@ -0,0 +1,64 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from app.mongo import get_mongo_db
+from app.routes.admin import require_admin
+from app.routes.auth import current_user_id
+from app.schemas import (
+    ApplicantProfile,
+    ApplicantProfileIn,
+    JobDetail,
+    JobMatchResponse,
+    JobPage,
+    JobsIngestRequest,
+    JobsIngestResponse,
+)
+from app.services.jobs_service import get_job, get_profile, ingest_jobs, list_jobs, match_jobs, upsert_profile
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+@router.post("/bulk", response_model=JobsIngestResponse, dependencies=[Depends(require_admin)])
+async def bulk_ingest(req: JobsIngestRequest, mongo=Depends(get_mongo_db)):
+    """
+    Upsert up to 10,000 postings by id (admin only). Replaying a feed is safe.
+    Returns: {received, inserted, updated, unchanged}
+    """
+    return await ingest_jobs(mongo, req.jobs)
+
+@router.get("", response_model=JobPage)
+async def browse_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    skill: Optional[str] = None,
+    company: Optional[str] = None,
+    remote: Optional[bool] = None,
+    mongo=Depends(get_mongo_db),
+):
+    """
+    Newest postings first, without descriptions. Pass `next_cursor` as
+    `cursor` for the following page. Returns: {jobs: [...], next_cursor}
+    """
+    return await list_jobs(mongo, limit, cursor, skill, company, remote)
+
+@router.get("/profile", response_model=ApplicantProfile)
+async def read_profile(user_id: int = Depends(current_user_id), mongo=Depends(get_mongo_db)):
+    return await get_profile(mongo, user_id)
+
+@router.put("/profile", response_model=ApplicantProfile)
+async def save_profile(req: ApplicantProfileIn, user_id: int = Depends(current_user_id),
+                       mongo=Depends(get_mongo_db)):
+    return await upsert_profile(mongo, user_id, req)
+
+@router.get("/matches", response_model=JobMatchResponse)
+async def job_matches(limit: int = Query(20, ge=1, le=100), user_id: int = Depends(current_user_id),
+                      mongo=Depends(get_mongo_db)):
+    """
+    Postings ranked by skill overlap with the current user's applicant
+    profile. `truncated` is true when the latency budget cut the candidate
+    scan short. Returns: {matches: [{job, score, matched_skills}], ...}
+    """
+    return await match_jobs(mongo, user_id, limit)
+
+# Declared last so /jobs/profile and /jobs/matches are not taken for ids
+@router.get("/{job_id}", response_model=JobDetail)
+async def job_detail(job_id: str, mongo=Depends(get_mongo_db)):
+    return await get_job(mongo, job_id)
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 # Data for registration
 class UserCreate(BaseModel):
@@ -10,3 +12,107 @@ class UserCreate(BaseModel):
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
+
+# ----------------------
+# Response models
+# ----------------------
+# Routes declare these as response_model, so FastAPI validates the result and
+# serializes it straight to JSON bytes in pydantic-core, skipping
+# jsonable_encoder and json.dumps.
+
+# Public profile; also the shape stored in the user cache
+class UserProfile(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    email: str
+    is_verified: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+class UserResponse(BaseModel):
+    user: UserProfile
+
+class MessageResponse(BaseModel):
+    message: str
+
+class LoginResponse(MessageResponse):
+    user: UserProfile
+
+class UsersByIdResponse(BaseModel):
+    users: List[Optional[UserProfile]]
+    missing: List[int]
+
+class UsersByEmailResponse(BaseModel):
+    users: List[Optional[UserProfile]]
+    missing: List[str]
+
+class UserPage(BaseModel):
+    users: List[UserProfile]
+    next_cursor: Optional[str] = None
+
+# ----------------------
+# Jobs
+# ----------------------
+class JobIn(BaseModel):
+    id: str = Field(min_length=1, max_length=200)  # the source's posting id
+    title: str
+    company: str
+    location: Optional[str] = None
+    remote: bool = False
+    skills: List[str] = Field(default_factory=list, max_length=100)
+    description: str = ""
+    posted_at: datetime
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+
+class JobsIngestRequest(BaseModel):
+    jobs: List[JobIn] = Field(min_length=1, max_length=10_000)
+
+class JobsIngestResponse(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int
+
+# Listing rows: everything but the description
+class JobSummary(BaseModel):
+    id: str
+    title: str
+    company: str
+    location: Optional[str] = None
+    remote: bool = False
+    skills: List[str] = []
+    posted_at: datetime
+
+class JobDetail(JobSummary):
+    description: str = ""
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+
+class JobPage(BaseModel):
+    jobs: List[JobSummary]
+    next_cursor: Optional[str] = None
+
+class ApplicantProfileIn(BaseModel):
+    skills: List[str] = Field(min_length=1, max_length=200)
+    headline: Optional[str] = None
+    location: Optional[str] = None
+
+class ApplicantProfile(ApplicantProfileIn):
+    user_id: int
+    updated_at: Optional[datetime] = None
+
+class JobMatch(BaseModel):
+    job: JobSummary
+    score: float
+    matched_skills: List[str]
+
+class JobMatchResponse(BaseModel):
+    matches: List[JobMatch]
+    candidates_scored: int
+    # True when the candidate scan stopped early to stay within the latency budget
+    truncated: bool
+    elapsed_ms: float
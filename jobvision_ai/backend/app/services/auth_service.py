@@ -1,85 +1,46 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-import hashlib
 import os
-import smtplib
-from email.mime.text import MIMEText
 import jwt
 from fastapi import Response, HTTPException, Cookie, Request
-from app.models import User
-from app.db import get_db
+from app.models import User, utcnow
+from app.schemas import UserProfile
+from app.services.email_outbox import enqueue_email, outbox_worker
+from app.services.password_service import password_hasher
+from app.services.token_service import REFRESH_TOKEN_EXPIRE_DAYS, refresh_tokens
+from app.services.user_cache import token_cache, user_cache
+from app.services.verification_codes import (
+    CODE_EXPIRED,
+    CODE_LOCKED,
+    CODE_MISSING,
+    CODE_OK,
+    VERIFICATION_CODE_TTL_SECONDS,
+    verification_codes,
+)
+from app.utils.metrics import timed
+from app.utils.normalize import normalize_email
 
 # Load environment variables
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 15))
-REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
-EMAIL_USER = os.getenv("EMAIL_USER")
-EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
-
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(password: str, hashed: str) -> bool:
-    return hash_password(password) == hashed
 
 def create_access_token(data: dict, expires_delta=None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    with timed("jwt_encode"):
+        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def create_refresh_token(data: dict, expires_delta=None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
-def send_verification_email(email: str, code: str):
-    subject = "Verify your JobVision account"
-    body = f"Hello,\n\nYour verification code is: {code}\nThis code will expire in 5 minutes.\n\n- JobVision AI Team"
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = EMAIL_USER
-    msg["To"] = email
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(EMAIL_USER, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_USER, email, msg.as_string())
-    except Exception as e:
-        print(f"❌ Email sending failed: {e}")
-        raise
-
-async def register_user(email: str, name: str, password: str, db: Session):
-    user = db.query(User).filter(User.email == email.lower()).first()
-    if user:
-        return {"error": "User already exists"}
-
-    hashed_pw = hash_password(password)
-    verification_code = os.urandom(3).hex()
-
-    new_user = User(
-        email=email.lower(),
-        name=name,
-        password=hashed_pw,
-        is_verified=False,
-        verification_code=verification_code
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    send_verification_email(email, verification_code)
-    return {"message": "Verification code sent to your email"}
-
-async def login_user(email: str, password: str, response: Response, db: Session):
-    user = db.query(User).filter(User.email == email.lower()).first()
-    if not user or not verify_password(password, user.password):
-        return {"error": "Invalid credentials"}
-
-    access_token = create_access_token({"email": email.lower()})
-    refresh_token = create_refresh_token({"email": email.lower()})
+    with timed("jwt_encode"):
+        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def set_auth_cookies(response: Response, access_token: str, refresh_token: str):
     response.set_cookie(
         key="access_token",
         value=access_token,
@@ -99,103 +60,259 @@ async def login_user(email: str, password: str, response: Response, db: Session)
         path="/",
     )
 
+def queue_verification_email(db: AsyncSession, email: str, code: str):
+    subject = "Verify your JobVision account"
+    body = f"Hello,\n\nYour verification code is: {code}\nThis code will expire in {VERIFICATION_CODE_TTL_SECONDS // 60} minutes.\n\n- JobVision AI Team"
+    enqueue_email(db, email, subject, body)
+
+def serialize_user(user: User) -> dict:
+    # JSON-ready dict rather than the model: it goes into the cache, whose
+    # shared backends store plain JSON
+    return UserProfile.model_validate(user).model_dump(mode="json")
+
+def user_by_email_query(email: str):
+    return select(User).where(User.email_normalized == normalize_email(email))
+
+def users_by_emails_query(emails):
+    return select(User).where(User.email_normalized.in_([normalize_email(email) for email in emails]))
+
+def users_by_ids_query(user_ids):
+    return select(User).where(User.id.in_(list(user_ids)))
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(user_by_email_query(email))
+    return result.scalars().first()
+
+async def register_user(email: str, name: str, password: str, db: AsyncSession):
+    user = await get_user_by_email(db, email)
+    if user:
+        return {"error": "User already exists"}
+
+    hashed_pw = await password_hasher.hash(password)
+    verification_code = os.urandom(3).hex()
+
+    new_user = User(
+        email=normalize_email(email),
+        name=name,
+        password=hashed_pw,
+        is_verified=False,
+    )
+    db.add(new_user)
+    await verification_codes.issue(db, new_user.email, verification_code)
+    queue_verification_email(db, new_user.email, verification_code)
+    await db.commit()
+    outbox_worker.notify()
+
+    return {"message": "Verification code sent to your email"}
+
+async def login_user(email: str, password: str, response: Response, db: AsyncSession):
+    user = await get_user_by_email(db, email)
+    if not user or not await password_hasher.verify(password, user.password):
+        return {"error": "Invalid credentials"}
+
+    if password_hasher.needs_rehash(user.password):
+        # Upgrade legacy SHA-256 (or weaker bcrypt) hashes now that we know the password
+        user.password = await password_hasher.hash(password)
+        await db.commit()
+
+    claims = {"email": user.email_normalized, "id": user.id}
+    access_token = create_access_token(claims)
+    refresh_token = create_refresh_token({**claims, **refresh_tokens.new_claims()})
+    set_auth_cookies(response, access_token, refresh_token)
+
     return {
         "message": "Login successful",
-        "user": {
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "is_verified": user.is_verified,
-            "created_at": user.created_at.isoformat() if user.created_at else None
-        }
+        "user": serialize_user(user),
     }
 
-async def logout_user(response: Response):
+def decode_token(token: str, kind: str) -> dict:
+    try:
+        with timed("jwt_decode"):
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail=f"{kind} token expired")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail=f"Invalid {kind.lower()} token")
+
+async def refresh_session(request: Request, response: Response):
+    """
+    Rotate the refresh token: a signature check and two set lookups, no DB.
+    """
+    token = request.cookies.get("refresh_token")
+    if not token:
+        raise HTTPException(status_code=401, detail="Missing refresh token")
+
+    payload = decode_token(token, "Refresh")
+    await refresh_tokens.consume(payload)
+
+    claims = {"email": payload["email"], "id": payload.get("id")}
+    access_token = create_access_token(claims)
+    refresh_token = create_refresh_token({**claims, **refresh_tokens.new_claims(payload["fid"])})
+    set_auth_cookies(response, access_token, refresh_token)
+    return {"message": "Token refreshed"}
+
+async def logout_user(request: Request, response: Response):
+    token = request.cookies.get("refresh_token")
+    if token:
+        try:
+            await refresh_tokens.revoke(decode_token(token, "Refresh"))
+        except HTTPException:
+            pass  # expired or forged tokens need no revoking
     response.delete_cookie("access_token", path="/")
     response.delete_cookie("refresh_token", path="/")
     return {"message": "Logged out"}
 
-async def get_current_user(request: Request, db: Session):
+async def get_current_user(request: Request, db: AsyncSession):
     access_token = request.cookies.get("access_token")
     if not access_token:
         raise HTTPException(status_code=401, detail="Missing access token")
 
-    try:
-        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("email")
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Access token expired")
-    except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid access token")
+    payload = token_cache.get(access_token)
+    if payload is None:
+        payload = decode_token(access_token, "Access")
+        if payload.get("type") == "refresh":
+            raise HTTPException(status_code=401, detail="Invalid access token")
+        token_cache.put(access_token, payload)
 
-    user = db.query(User).filter(User.email == email.lower()).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # Tokens issued before user ids were embedded only carry the email
+    user_id = payload.get("id")
+    profile = await user_cache.get(user_id) if user_id is not None else None
+    if profile is None:
+        user = await get_user_by_email(db, payload.get("email"))
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        profile = serialize_user(user)
+        await user_cache.put(profile)
 
-    return {
-        "user": {
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "is_verified": user.is_verified,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-        }
-    }
+    return {"user": profile}
 
-async def verify_user_email(email: str, code: str, db: Session):
-    user = db.query(User).filter(User.email == email.lower()).first()
-    if not user:
-        return {"error": "User not found"}
+async def verify_user_email(email: str, code: str, db: AsyncSession):
+    status = await verification_codes.check(db, email, code)
+    if status != CODE_OK:
+        # Persist the failed-attempt count before answering
+        await db.commit()
+        if status == CODE_MISSING:
+            # No pending code: verified already, never registered, or the
+            # sweeper removed an expired code
+            user = await get_user_by_email(db, email)
+            if not user:
+                return {"error": "User not found"}
+            if user.is_verified:
+                return {"message": "User already verified"}
+        if status in (CODE_EXPIRED, CODE_MISSING):
+            return {"error": "Verification code expired, please request a new one"}
+        if status == CODE_LOCKED:
+            return {"error": "Too many attempts, please request a new code"}
+        return {"error": "Invalid verification code"}
 
-    if user.is_verified:
+    # The only write to the users row: flip is_verified once
+    now = utcnow()
+    result = await db.execute(
+        update(User)
+        .where(User.email_normalized == normalize_email(email), User.is_verified.is_(False))
+        .values(is_verified=True, verified_at=now, updated_at=now, version=User.version + 1)
+        .returning(User)
+    )
+    user = result.scalars().first()
+    await verification_codes.discard(db, email)
+    await db.commit()
+    if not user:
         return {"message": "User already verified"}
-    if user.verification_code != code:
-        return {"error": "Invalid verification code"}
 
-    user.is_verified = True
-    user.verified_at = datetime.utcnow()
-    user.verification_code = None
-    db.commit()
+    # Write the fresh profile through rather than just invalidating, so a lagging
+    # read replica cannot repopulate the cache with the unverified row
+    await user_cache.put(serialize_user(user))
 
     return {"message": "Email verified successfully"}
 
-async def resend_verification_code(email: str, db: Session):
-    user = db.query(User).filter(User.email == email.lower()).first()
+async def resend_verification_code(email: str, db: AsyncSession):
+    user = await get_user_by_email(db, email)
     if not user:
         return {"error": "User not found"}
     if user.is_verified:
         return {"message": "User already verified"}
 
     verification_code = os.urandom(3).hex()
-    user.verification_code = verification_code
-    db.commit()
+    await verification_codes.issue(db, user.email, verification_code)
+    queue_verification_email(db, user.email, verification_code)
+    await db.commit()
+    outbox_worker.notify()
 
-    send_verification_email(email, verification_code)
     return {"message": "Verification code resent!"}
 
-async def fetch_user_by_email(email: str, db: Session):
-    email = email.lower().strip()
-    user = db.query(User).filter(User.email == email).first()
+async def fetch_user_by_email(email: str, db: AsyncSession):
+    profile = await user_cache.get_by_email(email)
+    if profile is not None:
+        return profile
+
+    user = await get_user_by_email(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "is_verified": user.is_verified,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-    }
+    profile = serialize_user(user)
+    await user_cache.put(profile)
+    return profile
+
+async def fetch_user_by_id(user_id: int, db: AsyncSession):
+    profile = await user_cache.get(user_id)
+    if profile is not None:
+        return profile
 
-async def fetch_user_by_id(user_id: str, db: Session):
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    profile = serialize_user(user)
+    await user_cache.put(profile)
+    return profile
+# ----------------------
+# Batch lookups
+# ----------------------
+async def load_users_by_ids(user_ids, db: AsyncSession) -> dict:
+    """
+    Resolve many ids with the profile cache plus at most one IN query.
+    Returns {id: profile} for the ids that exist.
+    """
+    found = {}
+    missing = []
+    for user_id in user_ids:
+        profile = await user_cache.get(user_id)
+        if profile is not None:
+            found[user_id] = profile
+        else:
+            missing.append(user_id)
+
+    if missing:
+        result = await db.execute(users_by_ids_query(missing))
+        for user in result.scalars():
+            profile = serialize_user(user)
+            await user_cache.put(profile)
+            found[user.id] = profile
+    return found
+
+async def load_users_by_emails(emails, db: AsyncSession) -> dict:
+    """
+    Resolve many already-normalized emails with one IN query.
+    Returns {email: profile} for the emails that exist.
+    """
+    result = await db.execute(users_by_emails_query(emails))
+    found = {}
+    for user in result.scalars():
+        profile = serialize_user(user)
+        await user_cache.put(profile)
+        found[user.email_normalized] = profile
+    return found
+
+async def fetch_users_by_ids(user_ids, loaders):
+    profiles = await loaders.by_id.load_many(user_ids)
     return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "is_verified": user.is_verified,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-    }
\ No newline at end of file
+        "users": profiles,
+        "missing": [user_id for user_id, profile in zip(user_ids, profiles) if profile is None],
+    }
+
+async def fetch_users_by_emails(emails, loaders):
+    profiles = await loaders.by_email.load_many([normalize_email(email) for email in emails])
+    return {
+        "users": profiles,
+        "missing": [email for email, profile in zip(emails, profiles) if profile is None],
+    }
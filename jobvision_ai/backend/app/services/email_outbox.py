@@ -0,0 +1,352 @@
+"""
+Durable email outbox.
+
+Request handlers only insert a row into `email_outbox` inside their own
+transaction. A background `OutboxWorker` claims due rows in batches and sends
+them over a small pool of persistent SMTP connections, retrying failures with
+exponential backoff. `purge_forever` deletes sent and failed rows once they
+are older than their retention period, so the table only holds recent mail.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import timedelta
+from email.message import EmailMessage
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import AsyncSessionLocal
+from app.models import EmailOutbox, utcnow
+from app.utils.metrics import STEP_LATENCY
+
+EMAIL_USER = os.getenv("EMAIL_USER")
+EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 465))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true" if SMTP_PORT == 465 else "false").lower() == "true"
+SMTP_START_TLS = os.getenv("SMTP_START_TLS", "false").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 30))
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 20))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", 2))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 6))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", 5))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", 600))
+# How long a claimed row stays invisible to other workers while it is being sent
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", 120))
+# Finished rows are kept this long for debugging, then deleted in chunks
+OUTBOX_SENT_RETENTION_DAYS = float(os.getenv("OUTBOX_SENT_RETENTION_DAYS", 7))
+OUTBOX_FAILED_RETENTION_DAYS = float(os.getenv("OUTBOX_FAILED_RETENTION_DAYS", 30))
+OUTBOX_PURGE_SECONDS = float(os.getenv("OUTBOX_PURGE_SECONDS", 3600))
+OUTBOX_PURGE_CHUNK = int(os.getenv("OUTBOX_PURGE_CHUNK", 1000))
+
+
+def enqueue_email(db: AsyncSession, to_email: str, subject: str, body: str) -> EmailOutbox:
+    """
+    Add an email to the outbox. The caller commits, so the email is only
+    queued if the rest of its transaction succeeds.
+    """
+    message = EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(message)
+    return message
+
+
+def build_message(row: EmailOutbox) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = row.subject
+    msg["From"] = EMAIL_USER
+    msg["To"] = row.to_email
+    msg.set_content(row.body)
+    return msg
+
+
+# ----------------------
+# Transports
+# ----------------------
+class SMTPTransport:
+    """
+    One persistent SMTP connection, reconnected lazily when it drops.
+    aiosmtplib is imported on first use so processes that never send
+    (or use the memory transport) don't load it.
+    """
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, use_tls=SMTP_USE_TLS,
+                 start_tls=SMTP_START_TLS, username=EMAIL_USER, password=EMAIL_PASSWORD,
+                 timeout=SMTP_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._client = None
+
+    async def _connect(self):
+        import aiosmtplib
+
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username and self.password:
+            await client.login(self.username, self.password)
+        self._client = client
+
+    async def send(self, message: EmailMessage):
+        if self._client is None or not self._client.is_connected:
+            await self._connect()
+        import aiosmtplib
+
+        try:
+            await self._client.send_message(message)
+        except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+            # The server closed an idle connection; retry once on a fresh one
+            await self._connect()
+            await self._client.send_message(message)
+
+    async def close(self):
+        if self._client is not None and self._client.is_connected:
+            import aiosmtplib
+
+            try:
+                await self._client.quit()
+            except aiosmtplib.SMTPException:
+                pass
+        self._client = None
+
+
+class MemoryTransport:
+    """Collects messages instead of sending them. Used by benchmarks and local runs."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message: EmailMessage):
+        self.sent.append(message)
+
+    async def close(self):
+        pass
+
+
+TRANSPORTS = {
+    "smtp": SMTPTransport,
+    "memory": MemoryTransport,
+}
+
+
+def default_transport_factory():
+    return TRANSPORTS[os.getenv("EMAIL_TRANSPORT", "smtp")]()
+
+
+class TransportPool:
+    """A fixed number of transports handed out to concurrent senders."""
+
+    def __init__(self, factory, size: int):
+        self._transports = [factory() for _ in range(size)]
+        self._idle = asyncio.Queue()
+        for transport in self._transports:
+            self._idle.put_nowait(transport)
+
+    async def send(self, message: EmailMessage):
+        transport = await self._idle.get()
+        try:
+            await transport.send(message)
+        except Exception:
+            # Drop the broken connection so the next send reconnects
+            await transport.close()
+            raise
+        finally:
+            self._idle.put_nowait(transport)
+
+    async def close(self):
+        for transport in self._transports:
+            await transport.close()
+
+
+# ----------------------
+# Worker
+# ----------------------
+class OutboxWorker:
+    def __init__(self, session_factory=AsyncSessionLocal, transport_factory=default_transport_factory,
+                 pool_size=SMTP_POOL_SIZE, batch_size=OUTBOX_BATCH_SIZE,
+                 poll_seconds=OUTBOX_POLL_SECONDS, max_attempts=OUTBOX_MAX_ATTEMPTS):
+        self.session_factory = session_factory
+        self.transport_factory = transport_factory
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+
+        self.pool = None
+        self._task = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+        self.queue_depth = 0
+        self.sent_total = 0
+        self.failed_total = 0
+        self.retried_total = 0
+        self.purged_total = 0
+        self._latencies = deque(maxlen=1000)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._stopping = False
+        self.pool = TransportPool(self.transport_factory, self.pool_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self.pool is not None:
+            await self.pool.close()
+
+    def notify(self):
+        """Wake the worker early, e.g. right after a request queued an email."""
+        self._wakeup.set()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                print(f"❌ Outbox worker error: {e}")
+                processed = 0
+            if processed < self.batch_size:
+                # Nothing more is due right now; sleep until poked or the next poll
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def _claim(self, db: AsyncSession):
+        now = utcnow()
+        result = await db.execute(
+            select(EmailOutbox)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.scalars().all()
+        for row in rows:
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+        await db.commit()
+        return rows
+
+    async def _send(self, row: EmailOutbox):
+        start = time.perf_counter()
+        try:
+            await self.pool.send(build_message(row))
+        except Exception as e:
+            return e
+        finally:
+            elapsed = time.perf_counter() - start
+            self._latencies.append(elapsed)
+            STEP_LATENCY.labels(step="smtp_send").observe(elapsed)
+        return None
+
+    async def drain_once(self) -> int:
+        """Claim and send one batch. Returns the number of rows processed."""
+        async with self.session_factory() as db:
+            rows = await self._claim(db)
+            if rows:
+                errors = await asyncio.gather(*(self._send(row) for row in rows))
+                now = utcnow()
+                for row, error in zip(rows, errors):
+                    if error is None:
+                        row.status = "sent"
+                        row.sent_at = now
+                        row.last_error = None
+                        self.sent_total += 1
+                    elif row.attempts >= self.max_attempts:
+                        row.status = "failed"
+                        row.last_error = str(error)
+                        self.failed_total += 1
+                        print(f"❌ Email to {row.to_email} failed permanently: {error}")
+                    else:
+                        backoff = min(OUTBOX_BACKOFF_SECONDS * 2 ** (row.attempts - 1),
+                                      OUTBOX_MAX_BACKOFF_SECONDS)
+                        row.next_attempt_at = now + timedelta(seconds=backoff)
+                        row.last_error = str(error)
+                        self.retried_total += 1
+                await db.commit()
+
+            self.queue_depth = await db.scalar(
+                select(func.count()).select_from(EmailOutbox).where(EmailOutbox.status == "pending")
+            )
+        return len(rows)
+
+    async def purge(self, now=None) -> int:
+        """
+        Delete sent and failed rows past their retention. A finished row's
+        next_attempt_at is its last claim, so this is a range scan on the
+        (status, next_attempt_at) index; chunks keep each transaction short.
+        """
+        now = now or utcnow()
+        removed = 0
+        for status, days in (("sent", OUTBOX_SENT_RETENTION_DAYS), ("failed", OUTBOX_FAILED_RETENTION_DAYS)):
+            cutoff = now - timedelta(days=days)
+            while True:
+                async with self.session_factory() as db:
+                    ids = select(EmailOutbox.id).where(
+                        EmailOutbox.status == status, EmailOutbox.next_attempt_at < cutoff
+                    ).limit(OUTBOX_PURGE_CHUNK)
+                    result = await db.execute(delete(EmailOutbox).where(EmailOutbox.id.in_(ids)))
+                    await db.commit()
+                removed += result.rowcount
+                if result.rowcount < OUTBOX_PURGE_CHUNK:
+                    break
+                await asyncio.sleep(0)
+        self.purged_total += removed
+        return removed
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3) if latencies else None
+
+        return {
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "sent_total": self.sent_total,
+            "failed_total": self.failed_total,
+            "retried_total": self.retried_total,
+            "purged_total": self.purged_total,
+            "send_latency_ms": {"p50": pct(0.50), "p99": pct(0.99), "samples": len(latencies)},
+        }
+
+
+outbox_worker = OutboxWorker()
+
+
+async def purge_forever(interval: float = OUTBOX_PURGE_SECONDS):
+    """Background task started from the app lifespan."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await outbox_worker.purge()
+            if removed:
+                print(f"🧹 Removed {removed} finished outbox emails")
+        except Exception as e:
+            print(f"❌ Outbox purge failed: {e}")
@@ -0,0 +1,229 @@
+"""
+Job postings and applicant profiles in MongoDB.
+
+Listing reads only the summary fields and pages with a keyset cursor on
+(posted_at, _id), newest first, so every page is one range over the
+posted_at_id index. Ingestion upserts by posting id in unordered bulk writes.
+Matching fetches just the skills of postings that share at least one skill
+with the applicant (multikey index), scores them all at once with
+app.utils.skill_match, and only then loads the summaries of the winners.
+The candidate scan stops early if it would eat into MATCH_BUDGET_MS.
+
+pymongo and NumPy are imported inside the functions that need them, so
+importing the app does not pay for them when job search is not configured.
+"""
+import base64
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+
+from app.models import utcnow
+from app.mongo import JOBS_COLLECTION, PROFILES_COLLECTION
+from app.utils.metrics import timed
+from app.utils.normalize import normalize_skill
+
+INGEST_BATCH_SIZE = int(os.getenv("JOBS_INGEST_BATCH_SIZE", 1000))
+MATCH_CANDIDATE_LIMIT = int(os.getenv("MATCH_CANDIDATE_LIMIT", 5000))
+MATCH_BATCH_SIZE = int(os.getenv("MATCH_BATCH_SIZE", 1000))
+MATCH_BUDGET_MS = float(os.getenv("MATCH_BUDGET_MS", 200))
+# Share of the budget the candidate scan may use; the rest is for scoring
+MATCH_FETCH_SHARE = 0.75
+
+LISTING_ORDER = [("posted_at", -1), ("_id", -1)]
+SUMMARY_PROJECTION = {"title": 1, "company": 1, "location": 1, "remote": 1, "skills": 1, "posted_at": 1}
+DETAIL_PROJECTION = {**SUMMARY_PROJECTION, "description": 1, "salary_min": 1, "salary_max": 1}
+SKILLS_PROJECTION = {"skills": 1}
+PROFILE_PROJECTION = {"skills": 1, "headline": 1, "location": 1, "updated_at": 1}
+
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def normalize_skills(skills) -> list:
+    return sorted({normalize_skill(skill) for skill in skills if skill.strip()})
+
+
+def to_job(doc: dict) -> dict:
+    doc["id"] = doc.pop("_id")
+    return doc
+
+
+def encode_cursor(posted_at: datetime, job_id: str) -> str:
+    raw = json.dumps([as_utc(posted_at).isoformat(), job_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        posted_at, job_id = json.loads(base64.urlsafe_b64decode(padded))
+        return as_utc(datetime.fromisoformat(posted_at)), str(job_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ----------------------
+# Postings
+# ----------------------
+def job_document(job) -> dict:
+    return {
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "remote": job.remote,
+        "skills": normalize_skills(job.skills),
+        "description": job.description,
+        "posted_at": as_utc(job.posted_at),
+        "salary_min": job.salary_min,
+        "salary_max": job.salary_max,
+    }
+
+
+async def ingest_jobs(db, jobs) -> dict:
+    """
+    Upsert postings by id. Re-sending an unchanged posting is a no-op, so
+    feeds can be replayed safely.
+    """
+    from pymongo import UpdateOne
+
+    # Last occurrence wins when a payload repeats an id
+    latest = {job.id: job for job in jobs}
+    collection = db[JOBS_COLLECTION]
+    totals = {"received": len(jobs), "inserted": 0, "updated": 0, "unchanged": 0}
+    postings = list(latest.values())
+    now = utcnow()
+    for start in range(0, len(postings), INGEST_BATCH_SIZE):
+        batch = postings[start:start + INGEST_BATCH_SIZE]
+        requests = [
+            UpdateOne({"_id": job.id}, {"$set": job_document(job), "$setOnInsert": {"created_at": now}}, upsert=True)
+            for job in batch
+        ]
+        with timed("jobs_bulk_upsert"):
+            result = await collection.bulk_write(requests, ordered=False)
+        totals["inserted"] += result.upserted_count
+        totals["updated"] += result.modified_count
+        totals["unchanged"] += result.matched_count - result.modified_count
+    return totals
+
+
+async def list_jobs(db, limit: int = 20, cursor: str = None, skill: str = None,
+                    company: str = None, remote: bool = None) -> dict:
+    query = {}
+    if skill:
+        query["skills"] = normalize_skill(skill)
+    if company:
+        query["company"] = company
+    if remote is not None:
+        query["remote"] = remote
+    if cursor:
+        posted_at, job_id = decode_cursor(cursor)
+        # The range bounds the index scan; the $or only filters the ties at
+        # posted_at, so the index still supplies the sort order
+        query["posted_at"] = {"$lte": posted_at}
+        query["$or"] = [{"posted_at": {"$lt": posted_at}}, {"_id": {"$lt": job_id}}]
+
+    # One extra document tells us whether there is a next page
+    docs = await db[JOBS_COLLECTION].find(query, SUMMARY_PROJECTION).sort(LISTING_ORDER).limit(limit + 1) \
+        .to_list(limit + 1)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_cursor(docs[-1]["posted_at"], docs[-1]["_id"]) if has_more else None
+    return {"jobs": [to_job(doc) for doc in docs], "next_cursor": next_cursor}
+
+
+async def get_job(db, job_id: str) -> dict:
+    doc = await db[JOBS_COLLECTION].find_one({"_id": job_id}, DETAIL_PROJECTION)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return to_job(doc)
+
+
+# ----------------------
+# Applicant profiles
+# ----------------------
+async def upsert_profile(db, user_id: int, profile) -> dict:
+    fields = {
+        "skills": normalize_skills(profile.skills),
+        "headline": profile.headline,
+        "location": profile.location,
+        "updated_at": utcnow(),
+    }
+    await db[PROFILES_COLLECTION].update_one({"_id": user_id}, {"$set": fields}, upsert=True)
+    return {"user_id": user_id, **fields}
+
+
+async def get_profile(db, user_id: int) -> dict:
+    doc = await db[PROFILES_COLLECTION].find_one({"_id": user_id}, PROFILE_PROJECTION)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Applicant profile not found")
+    doc["user_id"] = doc.pop("_id")
+    return doc
+
+
+# ----------------------
+# Matching
+# ----------------------
+async def fetch_candidates(db, skills: list, deadline: float):
+    """
+    Skills of the newest postings sharing a skill with the applicant.
+    Returns (docs, truncated): truncated when the deadline cut the scan short.
+    """
+    cursor = (
+        db[JOBS_COLLECTION]
+        .find({"skills": {"$in": skills}}, SKILLS_PROJECTION)
+        .sort(LISTING_ORDER)
+        .limit(MATCH_CANDIDATE_LIMIT)
+        .batch_size(MATCH_BATCH_SIZE)
+    )
+    candidates = []
+    async for doc in cursor:
+        candidates.append(doc)
+        if len(candidates) % MATCH_BATCH_SIZE == 0 and time.perf_counter() > deadline:
+            await cursor.close()
+            return candidates, True
+    return candidates, False
+
+
+async def match_jobs(db, user_id: int, limit: int = 20) -> dict:
+    from app.utils.skill_match import score_skill_overlap, top_k
+
+    start = time.perf_counter()
+    profile = await db[PROFILES_COLLECTION].find_one({"_id": user_id}, SKILLS_PROJECTION)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Applicant profile not found")
+    skills = profile["skills"]
+
+    with timed("job_match_fetch"):
+        deadline = start + MATCH_BUDGET_MS / 1000 * MATCH_FETCH_SHARE
+        candidates, truncated = await fetch_candidates(db, skills, deadline)
+
+    with timed("job_match_score"):
+        scores = score_skill_overlap(skills, [doc["skills"] for doc in candidates])
+        best = top_k(scores, limit)
+
+    # Full summaries only for the postings that made the cut
+    ranked_ids = [candidates[i]["_id"] for i in best]
+    docs = await db[JOBS_COLLECTION].find({"_id": {"$in": ranked_ids}}, SUMMARY_PROJECTION).to_list(len(ranked_ids))
+    by_id = {doc["_id"]: doc for doc in docs}
+
+    applicant_skills = set(skills)
+    matches = []
+    for i in best:
+        doc = by_id.get(candidates[i]["_id"])
+        if doc is None:  # deleted between the two reads
+            continue
+        matches.append({
+            "job": to_job(doc),
+            "score": round(float(scores[i]), 4),
+            "matched_skills": sorted(applicant_skills.intersection(candidates[i]["skills"])),
+        })
+    return {
+        "matches": matches,
+        "candidates_scored": len(candidates),
+        "truncated": truncated,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
@@ -0,0 +1,126 @@
+"""
+Password hashing off the event loop.
+
+bcrypt costs ~100+ ms of CPU per call, so hash/verify run on a process pool.
+The number of calls waiting for the pool is bounded: once it is full new
+calls fail fast with a 503 instead of queueing behind minutes of work.
+
+The pool is started with forkserver (spawn where that is unavailable), not
+fork: forking the threaded server can hand a child a lock some other thread
+held. A pool whose child died (e.g. OOM-killed) is replaced and the call
+retried once, instead of failing every later login until a restart.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+from app.utils import security
+from app.utils.metrics import timed
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+# Calls allowed to wait for a free worker, on top of the ones running
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", PASSWORD_HASH_WORKERS * 4))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", 1))
+PASSWORD_HASH_START_METHOD = os.getenv("PASSWORD_HASH_START_METHOD", "forkserver")
+
+
+def _mp_context():
+    method = PASSWORD_HASH_START_METHOD
+    if method not in multiprocessing.get_all_start_methods():
+        method = "spawn"
+    context = multiprocessing.get_context(method)
+    if method == "forkserver":
+        # Workers fork from a server that has bcrypt imported already
+        context.set_forkserver_preload(["app.utils.security"])
+    return context
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_size: int = PASSWORD_HASH_QUEUE_SIZE):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.in_flight = 0
+        self.rejected_total = 0
+        self.pool_restarts_total = 0
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so importing the app does not start workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+        return self._executor
+
+    def _replace_broken(self, executor: ProcessPoolExecutor):
+        # Every call that was running on the broken pool ends up here; only
+        # the first one swaps it out
+        if self._executor is executor:
+            self._executor = None
+            self.pool_restarts_total += 1
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                self._replace_broken(executor)
+                if attempt:
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Server is busy, please retry",
+                        headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+                    )
+
+    async def _run(self, step: str, fn, *args):
+        if self.in_flight >= self.capacity:
+            self.rejected_total += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+            )
+        self.in_flight += 1
+        try:
+            with timed(step):
+                return await self._submit(fn, *args)
+        finally:
+            self.in_flight -= 1
+
+    async def warm_up(self):
+        """Start the fork server and one worker so the first login doesn't wait for them."""
+        await self._submit(security.is_legacy_hash, "")
+
+    async def hash(self, password: str) -> str:
+        return await self._run("password_hash", security.hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        if security.is_legacy_hash(hashed):
+            # A single SHA-256 is cheaper than the round-trip to the pool
+            return security.verify_password(password, hashed)
+        return await self._run("password_verify", security.verify_password, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return security.needs_rehash(hashed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected_total": self.rejected_total,
+            "pool_restarts_total": self.pool_restarts_total,
+        }
+
+
+password_hasher = PasswordHasher()
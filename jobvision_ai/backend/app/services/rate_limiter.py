@@ -0,0 +1,122 @@
+"""
+Throttling for the expensive auth endpoints.
+
+Every limited action has a bucket per client IP and one per target email, so
+a single IP cannot spray many accounts and many IPs cannot hammer one
+account. Actions behind a login get a bucket per user id instead of email. Routes call `check` before any DB, hashing or SMTP work. Limits are
+"<requests>/<seconds>" strings from the environment, e.g.
+RATE_LIMIT_LOGIN_EMAIL=5/60; "0" disables a bucket.
+"""
+import asyncio
+import math
+import os
+
+from fastapi import HTTPException, Request
+
+from app.utils.normalize import normalize_email
+from app.utils.rate_limit import InMemoryRateLimitStore, RateLimitStore
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Only trust X-Forwarded-For when running behind our own reverse proxy
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+# How many of our proxies append to X-Forwarded-For in front of the app
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", 1))
+
+DEFAULT_LIMITS = {
+    "login": {"ip": "30/60", "email": "10/300"},
+    "register": {"ip": "10/3600", "email": "3/3600"},
+    "resend": {"ip": "10/3600", "email": "3/600"},
+    "batch_lookup": {"ip": "120/60", "user": "60/60"},
+}
+
+
+def parse_limit(spec: str):
+    """'10/60' -> (capacity 10, refill rate 10/60 per second); '0' -> None."""
+    if not spec or spec.strip() == "0":
+        return None
+    count, seconds = spec.split("/")
+    return float(count), float(count) / float(seconds)
+
+
+def load_limits() -> dict:
+    limits = {}
+    for action, scopes in DEFAULT_LIMITS.items():
+        for scope, default in scopes.items():
+            spec = os.getenv(f"RATE_LIMIT_{action.upper()}_{scope.upper()}", default)
+            limits[(action, scope)] = parse_limit(spec)
+    return limits
+
+
+def client_ip(request: Request) -> str:
+    """
+    The address our outermost proxy saw. Proxies append to X-Forwarded-For,
+    so everything left of the entry TRUSTED_PROXY_HOPS from the right was
+    written by the client and cannot be trusted.
+    """
+    if TRUST_PROXY_HEADERS and TRUSTED_PROXY_HOPS > 0:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(forwarded) >= TRUSTED_PROXY_HOPS:
+            return forwarded[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    def __init__(self, store: RateLimitStore = None, limits: dict = None, enabled: bool = RATE_LIMIT_ENABLED):
+        self.store = store if store is not None else InMemoryRateLimitStore()
+        self.limits = limits if limits is not None else load_limits()
+        self.enabled = enabled
+        self.allowed_total = 0
+        self.rejected_total = 0
+
+    async def check(self, action: str, request: Request, email: str = None, user_id: int = None):
+        """
+        Take a token from each bucket of `action`; raise 429 if any is empty.
+        """
+        if not self.enabled:
+            return
+        keys = [("ip", client_ip(request))]
+        if email:
+            keys.append(("email", normalize_email(email)))
+        if user_id is not None:
+            keys.append(("user", str(user_id)))
+
+        retry_after = 0.0
+        for scope, value in keys:
+            limit = self.limits.get((action, scope))
+            if limit is None:
+                continue
+            capacity, rate = limit
+            allowed, wait = await self.store.take(f"rl:{action}:{scope}:{value}", capacity, rate)
+            if not allowed:
+                retry_after = max(retry_after, wait)
+
+        if retry_after:
+            self.rejected_total += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        self.allowed_total += 1
+
+    def stats(self) -> dict:
+        stats = {"allowed_total": self.allowed_total, "rejected_total": self.rejected_total}
+        if isinstance(self.store, InMemoryRateLimitStore):
+            stats["tracked_keys"] = len(self.store)
+        return stats
+
+
+rate_limiter = RateLimiter()
+
+
+async def sweep_buckets_forever():
+    """Background task started from the app lifespan; drops idle in-memory buckets."""
+    store = rate_limiter.store
+    if not isinstance(store, InMemoryRateLimitStore):
+        return  # shared stores expire their keys themselves
+    while True:
+        await asyncio.sleep(store.sweep_interval)
+        try:
+            await store.sweep_gradually()
+        except Exception as e:
+            print(f"❌ Rate limit bucket sweep failed: {e}")
@@ -0,0 +1,66 @@
+"""
+Refresh-token rotation.
+
+Every refresh token carries a `jti` (its own id) and a `fid` (the login
+session, or "family", it belongs to). Using a refresh token consumes its jti;
+presenting an already-consumed jti means the token was copied, so the whole
+family is revoked. Both checks are set lookups in `store`, so a refresh
+never touches the users table or the password hasher.
+"""
+import os
+import time
+import uuid
+
+from fastapi import HTTPException
+
+from app.utils.revocation import InMemoryRevocationStore, RevocationStore
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
+
+
+class RefreshTokenService:
+    def __init__(self, store: RevocationStore = None, lifetime_seconds: float = REFRESH_TOKEN_EXPIRE_DAYS * 86400):
+        self.store = store if store is not None else InMemoryRevocationStore()
+        self.lifetime_seconds = lifetime_seconds
+        self.rotated_total = 0
+        self.reuse_detected_total = 0
+
+    @staticmethod
+    def new_claims(fid: str = None) -> dict:
+        return {"type": "refresh", "jti": uuid.uuid4().hex, "fid": fid or uuid.uuid4().hex}
+
+    async def consume(self, payload: dict):
+        """
+        Accept a decoded refresh token exactly once. Raises 401 when the token
+        or its family is revoked, and revokes the family on reuse.
+        """
+        jti, fid = payload.get("jti"), payload.get("fid")
+        if payload.get("type") != "refresh" or not jti or not fid:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        if await self.store.contains(f"fam:{fid}"):
+            raise HTTPException(status_code=401, detail="Refresh token revoked")
+        if not await self.store.add(f"jti:{jti}", payload["exp"]):
+            self.reuse_detected_total += 1
+            await self.revoke_family(fid)
+            raise HTTPException(status_code=401, detail="Refresh token reuse detected")
+        self.rotated_total += 1
+
+    async def revoke(self, payload: dict):
+        """Revoke a refresh token and its whole family, e.g. on logout."""
+        if payload.get("jti"):
+            await self.store.add(f"jti:{payload['jti']}", payload.get("exp", time.time()))
+        if payload.get("fid"):
+            await self.revoke_family(payload["fid"])
+
+    async def revoke_family(self, fid: str):
+        # The newest token of a family expires at most one lifetime from now
+        await self.store.add(f"fam:{fid}", time.time() + self.lifetime_seconds)
+
+    def stats(self) -> dict:
+        stats = {"rotated_total": self.rotated_total, "reuse_detected_total": self.reuse_detected_total}
+        if isinstance(self.store, InMemoryRevocationStore):
+            stats["revoked_entries"] = len(self.store)
+        return stats
+
+
+refresh_tokens = RefreshTokenService()
@@ -0,0 +1,112 @@
+"""
+Caches in front of /auth/me.
+
+`token_cache` maps a JWT's signature to its verified payload so repeat calls
+skip `jwt.decode`; an entry never outlives the token's `exp`.
+`user_cache` maps user id to the public profile dict, plus normalized email to
+user id so email lookups can use it too. It has an in-process
+level and an optional shared `CacheBackend`; writes that change a profile
+must call `invalidate`. Other workers' local level can serve the old profile
+for at most USER_CACHE_TTL seconds, so keep that short.
+"""
+import os
+import time
+
+from app.utils.cache import CacheBackend, TTLCache
+from app.utils.normalize import normalize_email
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10_000))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", 300))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10_000))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
+
+
+class TokenCache:
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl: float = TOKEN_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # The signature is unique per token and much shorter than the token
+        return token.rsplit(".", 1)[-1]
+
+    def get(self, token: str):
+        return self._cache.get(self._key(token))
+
+    def put(self, token: str, payload: dict):
+        exp = payload.get("exp")
+        ttl = self._cache.ttl if exp is None else exp - time.time()
+        self._cache.set(self._key(token), payload, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class UserProfileCache:
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL,
+                 backend: CacheBackend = None):
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.backend = backend
+        self.backend_hits = 0
+        self.backend_misses = 0
+
+    @staticmethod
+    def _key(user_id) -> str:
+        return f"user:{int(user_id)}"
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"user-email:{normalize_email(email)}"
+
+    async def _lookup(self, key: str):
+        value = self._local.get(key)
+        if value is not None or self.backend is None:
+            return value
+        value = await self.backend.get(key)
+        if value is None:
+            self.backend_misses += 1
+            return None
+        self.backend_hits += 1
+        self._local.set(key, value)
+        return value
+
+    async def get(self, user_id):
+        return await self._lookup(self._key(user_id))
+
+    async def get_by_email(self, email: str):
+        # An account's email never changes, so the email -> id entry can't go
+        # stale; the profile itself is still subject to invalidate()
+        user_id = await self._lookup(self._email_key(email))
+        return await self.get(user_id) if user_id is not None else None
+
+    async def put(self, profile: dict):
+        key = self._key(profile["id"])
+        email_key = self._email_key(profile["email"])
+        self._local.set(key, profile)
+        self._local.set(email_key, profile["id"])
+        if self.backend is not None:
+            await self.backend.set(key, profile, self._local.ttl)
+            await self.backend.set(email_key, profile["id"], self._local.ttl)
+
+    async def invalidate(self, user_id):
+        key = self._key(user_id)
+        self._local.delete(key)
+        if self.backend is not None:
+            await self.backend.delete(key)
+
+    def clear(self):
+        self._local.clear()
+
+    def stats(self) -> dict:
+        stats = self._local.stats()
+        if self.backend is not None:
+            stats["backend_hits"] = self.backend_hits
+            stats["backend_misses"] = self.backend_misses
+        return stats
+
+
+token_cache = TokenCache()
+user_cache = UserProfileCache()
@@ -0,0 +1,28 @@
+"""
+Per-request user loaders.
+
+Routes that may look up the same users several times (lists of applicants,
+nested objects) should take `loaders: UserLoaders = Depends(get_user_loaders)`
+and call `loaders.by_id.load(id)` / `loaders.by_email.load(email)`. All lookups
+made in the same tick are answered by one IN query, and duplicates are
+resolved once. FastAPI caches the dependency, so a request gets one instance.
+"""
+import asyncio
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_read_db
+from app.services.auth_service import load_users_by_emails, load_users_by_ids
+from app.utils.dataloader import DataLoader
+
+
+class UserLoaders:
+    def __init__(self, db: AsyncSession):
+        lock = asyncio.Lock()  # both loaders share the request's session
+        self.by_id = DataLoader(lambda ids: load_users_by_ids(ids, db), lock)
+        self.by_email = DataLoader(lambda emails: load_users_by_emails(emails, db), lock)
+
+
+def get_user_loaders(db: AsyncSession = Depends(get_read_db)) -> UserLoaders:
+    return UserLoaders(db)
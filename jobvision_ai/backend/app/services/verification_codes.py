@@ -0,0 +1,159 @@
+"""
+Email verification codes with real expiry and attempt limits.
+
+Codes are stored hashed, expire after VERIFICATION_CODE_TTL_SECONDS and are
+locked after VERIFICATION_MAX_ATTEMPTS wrong guesses until a new code is
+issued. Store methods take the caller's session so a code is written in the
+same transaction as the user row or outbox email it belongs to; the
+in-memory store ignores it. The caller commits.
+"""
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+from datetime import timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import AsyncSessionLocal
+from app.models import VerificationCode, utcnow
+from app.utils.normalize import normalize_email
+
+VERIFICATION_CODE_TTL_SECONDS = int(os.getenv("VERIFICATION_CODE_TTL_SECONDS", 300))
+VERIFICATION_MAX_ATTEMPTS = int(os.getenv("VERIFICATION_MAX_ATTEMPTS", 5))
+VERIFICATION_SWEEP_SECONDS = float(os.getenv("VERIFICATION_SWEEP_SECONDS", 60))
+VERIFICATION_CODE_STORE = os.getenv("VERIFICATION_CODE_STORE", "db")  # db | memory
+
+# Results of `check`
+CODE_OK = "ok"
+CODE_INVALID = "invalid"
+CODE_EXPIRED = "expired"
+CODE_LOCKED = "locked"
+CODE_MISSING = "missing"
+
+
+def hash_code(code: str) -> str:
+    return hashlib.sha256(code.strip().lower().encode()).hexdigest()
+
+
+def as_utc(value):
+    # SQLite hands back naive datetimes for timezone-aware columns
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class VerificationCodeStore:
+    async def issue(self, db: AsyncSession, email: str, code: str):
+        """Store a new code for `email`, replacing any previous one."""
+        raise NotImplementedError
+
+    async def check(self, db: AsyncSession, email: str, code: str) -> str:
+        """Returns one of CODE_OK, CODE_INVALID, CODE_EXPIRED, CODE_LOCKED, CODE_MISSING."""
+        raise NotImplementedError
+
+    async def discard(self, db: AsyncSession, email: str):
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        """Delete every expired code. Returns how many were removed."""
+        raise NotImplementedError
+
+
+class InMemoryVerificationCodeStore(VerificationCodeStore):
+    def __init__(self, ttl: float = VERIFICATION_CODE_TTL_SECONDS, max_attempts: int = VERIFICATION_MAX_ATTEMPTS):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self._codes = {}  # email -> [code_hash, expires_at, attempts]
+
+    async def issue(self, db, email: str, code: str):
+        self._codes[normalize_email(email)] = [hash_code(code), time.time() + self.ttl, 0]
+
+    async def check(self, db, email: str, code: str) -> str:
+        entry = self._codes.get(normalize_email(email))
+        if entry is None:
+            return CODE_MISSING
+        if entry[1] <= time.time():
+            return CODE_EXPIRED
+        if entry[2] >= self.max_attempts:
+            return CODE_LOCKED
+        if not hmac.compare_digest(entry[0], hash_code(code)):
+            entry[2] += 1
+            return CODE_INVALID
+        return CODE_OK
+
+    async def discard(self, db, email: str):
+        self._codes.pop(normalize_email(email), None)
+
+    async def sweep(self) -> int:
+        now = time.time()
+        expired = [email for email, entry in self._codes.items() if entry[1] <= now]
+        for email in expired:
+            del self._codes[email]
+        return len(expired)
+
+
+class DatabaseVerificationCodeStore(VerificationCodeStore):
+    def __init__(self, ttl: float = VERIFICATION_CODE_TTL_SECONDS, max_attempts: int = VERIFICATION_MAX_ATTEMPTS,
+                 session_factory=AsyncSessionLocal):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+
+    async def issue(self, db: AsyncSession, email: str, code: str):
+        email = normalize_email(email)
+        await db.execute(delete(VerificationCode).where(VerificationCode.email_normalized == email))
+        db.add(VerificationCode(
+            email_normalized=email,
+            code_hash=hash_code(code),
+            attempts=0,
+            expires_at=utcnow() + timedelta(seconds=self.ttl),
+        ))
+
+    async def check(self, db: AsyncSession, email: str, code: str) -> str:
+        result = await db.execute(
+            select(VerificationCode)
+            .where(VerificationCode.email_normalized == normalize_email(email))
+            .with_for_update()
+        )
+        entry = result.scalars().first()
+        if entry is None:
+            return CODE_MISSING
+        if as_utc(entry.expires_at) <= utcnow():
+            return CODE_EXPIRED
+        if entry.attempts >= self.max_attempts:
+            return CODE_LOCKED
+        if not hmac.compare_digest(entry.code_hash, hash_code(code)):
+            entry.attempts += 1
+            return CODE_INVALID
+        return CODE_OK
+
+    async def discard(self, db: AsyncSession, email: str):
+        await db.execute(delete(VerificationCode).where(VerificationCode.email_normalized == normalize_email(email)))
+
+    async def sweep(self) -> int:
+        # One range delete on the expires_at index
+        async with self.session_factory() as db:
+            result = await db.execute(delete(VerificationCode).where(VerificationCode.expires_at <= utcnow()))
+            await db.commit()
+        return result.rowcount
+
+
+STORES = {
+    "db": DatabaseVerificationCodeStore,
+    "memory": InMemoryVerificationCodeStore,
+}
+
+verification_codes = STORES[VERIFICATION_CODE_STORE]()
+
+
+async def sweep_forever(interval: float = VERIFICATION_SWEEP_SECONDS):
+    """Background task started from the app lifespan."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await verification_codes.sweep()
+            if removed:
+                print(f"🧹 Removed {removed} expired verification codes")
+        except Exception as e:
+            print(f"❌ Verification code sweep failed: {e}")
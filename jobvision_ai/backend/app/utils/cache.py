@@ -0,0 +1,107 @@
+"""
+Small in-process caches.
+
+`TTLCache` is a size-bounded LRU whose entries also expire. `CacheBackend` is
+the interface for an optional shared second level that several workers can
+read; `SharedStateCacheBackend` puts it on app.utils.shared_state and
+`InMemoryCacheBackend` is the local stand-in for it.
+"""
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class CacheBackend:
+    """Interface for a cache shared between workers."""
+
+    async def get(self, key: str):
+        raise NotImplementedError
+
+    async def set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int = 100_000, ttl: float = 3600):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str):
+        return self._cache.get(key)
+
+    async def set(self, key: str, value, ttl: float):
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        self._cache.delete(key)
+
+
+class SharedStateCacheBackend(CacheBackend):
+    """`CacheBackend` over a `SharedState`, so every worker sees one cache."""
+
+    def __init__(self, state):
+        self.state = state
+
+    async def get(self, key: str):
+        return await self.state.get(key)
+
+    async def set(self, key: str, value, ttl: float):
+        await self.state.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        await self.state.delete(key)
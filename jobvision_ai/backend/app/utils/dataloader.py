@@ -0,0 +1,63 @@
+"""
+Request-scoped batching of lookups.
+
+`DataLoader.load(key)` does not query right away: every key requested in the
+same event-loop tick is collected and resolved with one call to `batch_fn`,
+and repeated keys share one result for the lifetime of the loader. Create a
+loader per request so results never leak between users.
+"""
+import asyncio
+
+
+class DataLoader:
+    def __init__(self, batch_fn, lock: asyncio.Lock = None):
+        """
+        `batch_fn(keys)` is awaited with a list of unique keys and must return
+        a dict mapping each found key to its value; absent keys resolve to None.
+        Loaders that share a DB session must share `lock`, since a session
+        can't run two queries at once.
+        """
+        self.batch_fn = batch_fn
+        self.lock = lock or asyncio.Lock()
+        self._futures = {}
+        self._pending = []
+        self._scheduled = False
+
+    def load(self, key) -> asyncio.Future:
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+        self._pending.append(key)
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(lambda: loop.create_task(self._dispatch()))
+        return future
+
+    async def load_many(self, keys) -> list:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key, value):
+        """Seed a known value, e.g. a row the request already loaded."""
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    async def _dispatch(self):
+        keys, self._pending, self._scheduled = self._pending, [], False
+        try:
+            async with self.lock:
+                found = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(found.get(key))
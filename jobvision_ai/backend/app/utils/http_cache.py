@@ -0,0 +1,86 @@
+"""
+Conditional responses for user profile reads.
+
+The validators come from the profile dict itself: a weak ETag built from the
+user id and `version`, and Last-Modified from `updated_at` (or `created_at`
+for rows that predate it). A profile served from `user_cache` can therefore
+answer a matching If-None-Match with a bodyless 304 before any DB query or
+JSON encoding happens.
+"""
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.utils.responses import FastJSONResponse
+
+# 0 means the browser may store the profile but must revalidate every time,
+# which turns repeat polls into 304s; raise it to skip some polls entirely
+PROFILE_MAX_AGE = int(os.getenv("PROFILE_MAX_AGE", 0))
+
+
+def cache_control() -> str:
+    if PROFILE_MAX_AGE > 0:
+        return f"private, max-age={PROFILE_MAX_AGE}, must-revalidate"
+    return "private, no-cache"
+
+
+def profile_etag(profile: dict) -> Optional[str]:
+    if profile.get("version") is None:
+        return None
+    return f'W/"u{profile["id"]}-v{profile["version"]}"'
+
+
+def profile_last_modified(profile: dict) -> Optional[datetime]:
+    value = profile.get("updated_at") or profile.get("created_at")
+    if not value:
+        return None
+    modified = datetime.fromisoformat(value)
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return modified.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored whenever If-None-Match is present
+        return etag is not None and etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_profile_response(request: Request, profile: dict, body=None, vary: str = None) -> Response:
+    """
+    304 with the validators if the client already has this version of
+    `profile`, otherwise `body` (default: the profile) as JSON.
+    """
+    etag = profile_etag(profile)
+    last_modified = profile_last_modified(profile)
+    headers = {"Cache-Control": cache_control()}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if vary:
+        headers["Vary"] = vary
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(profile if body is None else body, headers=headers)
@@ -0,0 +1,164 @@
+"""
+Prometheus metrics shared by the middleware and the hot paths.
+
+Request-level numbers come from `app.middleware.metrics`. Expensive steps
+(JWT, password hashing, SMTP) are wrapped in `timed(step)`, and DB time is
+collected through SQLAlchemy cursor events by `instrument_engine`.
+
+With several worker processes (serve.py sets PROMETHEUS_MULTIPROC_DIR),
+counters, histograms and gauges are written to per-process files and
+`/metrics` sums them across workers via `metrics_registry()`. The
+StatsCollector/PoolCollector gauges are snapshots of in-process state and
+describe only the worker that answered the scrape.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", multiprocess_mode="livesum"
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Time spent in a single DB statement", buckets=LATENCY_BUCKETS
+)
+DB_REQUEST_TIME = Histogram(
+    "db_time_per_request_seconds", "Total DB time of a request's session", ["route"], buckets=LATENCY_BUCKETS
+)
+DB_REQUEST_QUERIES = Histogram(
+    "db_queries_per_request", "DB statements issued by a request's session", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection", ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+
+STEP_LATENCY = Histogram(
+    "hot_path_duration_seconds", "Latency of expensive sub-steps", ["step"], buckets=LATENCY_BUCKETS
+)
+
+# Per-request DB accounting; the middleware installs a fresh dict per request
+request_db_stats = ContextVar("request_db_stats", default=None)
+
+
+@contextmanager
+def timed(step: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STEP_LATENCY.labels(step=step).observe(time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["seconds"] += elapsed
+
+
+def instrument_engine(engine):
+    """Attach query timing to a sync Engine (use `async_engine.sync_engine` for async ones)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class StatsCollector:
+    """
+    Exports `stats()` dicts of in-process components (outbox, caches, hasher)
+    as gauges at scrape time. Nested dicts and non-numeric values are skipped.
+    """
+
+    def __init__(self):
+        self._sources = {}
+
+    def add(self, prefix: str, stats_fn):
+        self._sources[prefix] = stats_fn
+
+    def collect(self):
+        for prefix, stats_fn in self._sources.items():
+            for key, value in stats_fn().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                yield GaugeMetricFamily(f"{prefix}_{key}", f"{prefix} {key}", value=value)
+
+
+class PoolCollector:
+    """Exports size and utilization of every registered connection pool."""
+
+    def __init__(self):
+        self._engines = {}
+
+    def add(self, label: str, engine):
+        self._engines[label] = engine
+
+    def collect(self):
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["pool"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["pool"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond pool_size", labels=["pool"])
+        utilization = GaugeMetricFamily(
+            "db_pool_utilization", "Checked-out connections / (pool_size + max_overflow)", labels=["pool"]
+        )
+        for label, engine in self._engines.items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            checked_out.add_metric([label], pool.checkedout())
+            size.add_metric([label], pool.size())
+            overflow.add_metric([label], max(pool.overflow(), 0))
+            utilization.add_metric([label], pool.checkedout() / capacity if capacity else 0.0)
+        yield from (checked_out, size, overflow, utilization)
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
+register_pool = pool_collector.add
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+_multiprocess_registry = None
+
+
+def metrics_registry():
+    """The registry /metrics exposes: all workers' metrics in multiprocess mode."""
+    global _multiprocess_registry
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+    if _multiprocess_registry is None:
+        _multiprocess_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(_multiprocess_registry)
+        _multiprocess_registry.register(stats_collector)
+        _multiprocess_registry.register(pool_collector)
+    return _multiprocess_registry
+
+
+def mark_worker_exited():
+    # Drops this process's live gauges (in-flight requests) from the totals
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,10 @@
+def normalize_email(email: str) -> str:
+    """
+    Canonical form used for every user lookup and for users.email_normalized.
+    Change this only together with a re-run of backfill_email_normalized.py.
+    """
+    return email.strip().lower()
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form of a skill on job postings and applicant profiles."""
+    return " ".join(skill.split()).lower()
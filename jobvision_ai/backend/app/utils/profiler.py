@@ -0,0 +1,58 @@
+"""
+Opt-in sampling profiler for single requests.
+
+A background thread snapshots the event-loop thread's stack every few
+milliseconds while a request runs and writes the samples in the collapsed
+("folded") format read by flamegraph.pl and speedscope. The loop thread is
+shared, so samples taken while other requests run on it are included too.
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+
+class StackSampler:
+    def __init__(self, thread_id: int = None, interval: float = 0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stack(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            stack = self._stack()
+            if stack:
+                self.samples[stack] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def dump(self, directory: str, label: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label).strip("_")
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_label}-{uuid.uuid4().hex[:8]}.folded")
+        with open(path, "w") as f:
+            f.write(self.folded() + "\n")
+        return path
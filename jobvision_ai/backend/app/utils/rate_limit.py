@@ -0,0 +1,106 @@
+"""
+Token-bucket rate limiting.
+
+A bucket holds up to `capacity` tokens and refills at `rate` tokens/second;
+each request takes one. Stores own the bucket math so a shared backend can
+apply it atomically. `InMemoryRateLimitStore` keeps one small list per key
+and drops keys whose bucket has refilled completely, since a full bucket is
+the same as no entry at all. Dropping happens off the request path, in
+chunks (`sweep_gradually`), so millions of keys during credential stuffing
+never stall a request behind a full sweep.
+"""
+import asyncio
+import time
+
+
+class RateLimitStore:
+    """Interface for a bucket store shared between workers."""
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0):
+        """
+        Try to take `cost` tokens. Returns (allowed, retry_after_seconds).
+        """
+        raise NotImplementedError
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    def __init__(self, sweep_interval: float = 60.0, sweep_chunk: int = 1000):
+        self._buckets = {}  # key -> [tokens, updated_at, full_at]
+        self.sweep_interval = sweep_interval
+        self.sweep_chunk = sweep_chunk
+
+    def take_now(self, key: str, capacity: float, rate: float, cost: float = 1.0, now: float = None):
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+
+        if tokens < cost:
+            if bucket is None:
+                bucket = self._buckets[key] = [tokens, now, now]
+            bucket[0], bucket[1] = tokens, now
+            return False, (cost - tokens) / rate
+
+        tokens -= cost
+        full_at = now + (capacity - tokens) / rate
+        if bucket is None:
+            self._buckets[key] = [tokens, now, full_at]
+        else:
+            bucket[0], bucket[1], bucket[2] = tokens, now, full_at
+        return True, 0.0
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0):
+        return self.take_now(key, capacity, rate, cost)
+
+    def sweep(self, now: float = None, keys=None) -> int:
+        """Forget the buckets among `keys` (default: all) that have refilled to capacity."""
+        now = time.monotonic() if now is None else now
+        buckets = self._buckets
+        idle = [
+            key for key in (buckets if keys is None else keys)
+            if (bucket := buckets.get(key)) is not None and bucket[2] <= now
+        ]
+        for key in idle:
+            del buckets[key]
+        return len(idle)
+
+    async def sweep_gradually(self) -> int:
+        """
+        Sweep `sweep_chunk` keys at a time, yielding to the event loop between
+        chunks. Buckets created meanwhile wait for the next round.
+        """
+        keys = list(self._buckets)
+        removed = 0
+        for start in range(0, len(keys), self.sweep_chunk):
+            removed += self.sweep(keys=keys[start:start + self.sweep_chunk])
+            await asyncio.sleep(0)
+        return removed
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SharedStateRateLimitStore(RateLimitStore):
+    """
+    Limits shared by every worker through `SharedState.incr`.
+
+    A token bucket needs a read-modify-write that a plain key/value store
+    can't do atomically, so this uses a fixed window instead: `capacity`
+    requests per `capacity / rate` seconds, counted with one atomic
+    increment per request. Same long-run rate as the bucket, but a client
+    can burst up to twice the capacity across a window boundary.
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0):
+        window = capacity / rate
+        now = time.time()
+        index = int(now // window)
+        count = await self.state.incr(f"{key}:{index}", int(cost), ttl=window)
+        if count <= capacity:
+            return True, 0.0
+        return False, (index + 1) * window - now
@@ -0,0 +1,25 @@
+"""
+JSON response class for routes that build their own Response.
+
+Routes with a response_model don't need this: FastAPI serializes those to
+JSON bytes in pydantic-core, which is faster than any response class, and
+setting a default_response_class on the app would turn that path off. Paths
+that return a prebuilt dict (e.g. conditional profile responses) use
+`FastJSONResponse`, which renders with orjson when it is installed and falls
+back to the stdlib encoder otherwise.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,74 @@
+"""
+Expiring set of revoked token ids.
+
+Entries only need to live until the token they revoke would have expired
+anyway, so every entry carries that expiry and is swept afterwards; the set
+never grows beyond the tokens issued in one refresh lifetime.
+"""
+import time
+
+
+class RevocationStore:
+    """Interface for a revocation set shared between workers."""
+
+    async def add(self, key: str, expires_at: float) -> bool:
+        """
+        Revoke `key` until `expires_at` (epoch seconds). Returns False if it
+        was already revoked; shared backends must do this atomically (SETNX).
+        """
+        raise NotImplementedError
+
+    async def contains(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+class InMemoryRevocationStore(RevocationStore):
+    def __init__(self, sweep_interval: float = 60.0):
+        self._entries = {}  # key -> expires_at
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    def _maybe_sweep(self, now: float):
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+    async def add(self, key: str, expires_at: float) -> bool:
+        now = time.time()
+        self._maybe_sweep(now)
+        current = self._entries.get(key)
+        if current is not None and current > now:
+            return False
+        self._entries[key] = expires_at
+        return True
+
+    async def contains(self, key: str) -> bool:
+        expires_at = self._entries.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def sweep(self, now: float = None) -> int:
+        now = time.time() if now is None else now
+        expired = [key for key, expires_at in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SharedStateRevocationStore(RevocationStore):
+    """Revocation set on a `SharedState`; `add` maps onto its atomic set-if-absent."""
+
+    def __init__(self, state):
+        self.state = state
+
+    async def add(self, key: str, expires_at: float) -> bool:
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            # Already past expiry: nothing left to revoke
+            return True
+        return await self.state.add(key, 1, ttl)
+
+    async def contains(self, key: str) -> bool:
+        return await self.state.get(key) is not None
@@ -1,17 +1,29 @@
 # app/utils/security.py
 import bcrypt
-from datetime import datetime, timedelta
-from jose import jwt
+import hashlib
+import hmac
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+MAX_BCRYPT_LENGTH = 72  # bcrypt limitation
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+def is_legacy_hash(hashed_password: str) -> bool:
+    """
+    True for the unsalted SHA-256 hex digests written before bcrypt.
+    """
+    return len(hashed_password) == 64 and all(c in "0123456789abcdef" for c in hashed_password)
 
-MAX_BCRYPT_LENGTH = 72  # bcrypt limitation
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    True when a stored hash should be replaced on the next successful login.
+    """
+    if is_legacy_hash(hashed_password):
+        return True
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds < BCRYPT_ROUNDS
 
 def hash_password(password: str) -> str:
     """
@@ -19,30 +31,20 @@ def hash_password(password: str) -> str:
     """
     try:
         pw_bytes = password.encode("utf-8")[:MAX_BCRYPT_LENGTH]
-        hashed = bcrypt.hashpw(pw_bytes, bcrypt.gensalt())
+        hashed = bcrypt.hashpw(pw_bytes, bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
         return hashed.decode("utf-8")
     except Exception as e:
         raise ValueError(f"Failed to hash password: {e}")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against a bcrypt hash.
+    Verify a password against a bcrypt hash, or a legacy SHA-256 digest.
     """
+    if is_legacy_hash(hashed_password):
+        digest = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(digest, hashed_password)
     try:
         pw_bytes = plain_password.encode("utf-8")[:MAX_BCRYPT_LENGTH]
         return bcrypt.checkpw(pw_bytes, hashed_password.encode("utf-8"))
     except Exception as e:
         return False
-
-def create_access_token(data: dict, expires_delta: timedelta = None):
-    """
-    Create a JWT access token with an optional expiration.
-    """
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
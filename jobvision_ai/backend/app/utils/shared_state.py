@@ -0,0 +1,279 @@
+"""
+Key/value state shared between worker processes.
+
+In-process caches, rate limits and revocation sets diverge as soon as the
+app runs more than one worker. `SharedState` is the small interface they can
+sit on instead: get/set/delete with a TTL, `add` (set if absent) and an
+atomic `incr`. The implementation is chosen by URL:
+
+    memory://                      this process only (tests, one worker)
+    sqlite:////var/run/jv-state.db every worker on one host, via a WAL file
+    redis://host:6379/0            every worker on every host (needs `redis`)
+
+More schemes can be plugged in with `register_backend`. Values must be JSON
+serializable; TTLs are in seconds and None means no expiry.
+"""
+import asyncio
+import json
+import time
+from urllib.parse import urlparse
+
+
+class SharedState:
+    async def get(self, key: str):
+        raise NotImplementedError
+
+    async def set(self, key: str, value, ttl: float = None):
+        raise NotImplementedError
+
+    async def add(self, key: str, value, ttl: float = None) -> bool:
+        """Set `key` only if it is absent or expired. Returns True if it was set."""
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def incr(self, key: str, amount: int = 1, ttl: float = None) -> int:
+        """
+        Atomically add `amount` and return the new value. A missing or
+        expired key starts from zero, and `ttl` only applies when the key is
+        (re)created, so a counter expires `ttl` after its first increment.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+def expiry(ttl: float = None):
+    return None if ttl is None else time.time() + ttl
+
+
+class InMemorySharedState(SharedState):
+    def __init__(self, sweep_interval: float = 60.0):
+        self._entries = {}  # key -> [value, expires_at | None]
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    def _live(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= now:
+            del self._entries[key]
+            return None
+        return entry
+
+    def _maybe_sweep(self, now: float):
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+    async def get(self, key: str):
+        entry = self._live(key, time.time())
+        return None if entry is None else entry[0]
+
+    async def set(self, key: str, value, ttl: float = None):
+        now = time.time()
+        self._maybe_sweep(now)
+        self._entries[key] = [value, expiry(ttl)]
+
+    async def add(self, key: str, value, ttl: float = None) -> bool:
+        now = time.time()
+        self._maybe_sweep(now)
+        if self._live(key, now) is not None:
+            return False
+        self._entries[key] = [value, expiry(ttl)]
+        return True
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float = None) -> int:
+        now = time.time()
+        self._maybe_sweep(now)
+        entry = self._live(key, now)
+        if entry is None:
+            entry = self._entries[key] = [0, expiry(ttl)]
+        entry[0] += amount
+        return entry[0]
+
+    def sweep(self, now: float = None) -> int:
+        now = time.time() if now is None else now
+        expired = [key for key, (_, expires_at) in self._entries.items()
+                   if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteSharedState(SharedState):
+    """
+    One table in a WAL-mode SQLite file. Every operation is a single
+    autocommitted statement, so `add` and `incr` are atomic across processes;
+    readers never block the writer.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS shared_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL
+        )
+    """
+
+    def __init__(self, path: str, sweep_interval: float = 60.0, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self._next_sweep = time.time() + sweep_interval
+        self._db = None
+        self._lock = asyncio.Lock()
+
+    async def _conn(self):
+        if self._db is None:
+            async with self._lock:
+                if self._db is None:
+                    import aiosqlite
+
+                    db = await aiosqlite.connect(self.path, isolation_level=None)
+                    await db.execute("PRAGMA journal_mode=WAL")
+                    await db.execute("PRAGMA synchronous=NORMAL")
+                    await db.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+                    await db.execute(self.SCHEMA)
+                    self._db = db
+        return self._db
+
+    async def _maybe_sweep(self, db, now: float):
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            await db.execute("DELETE FROM shared_state WHERE expires_at <= ?", (now,))
+
+    async def get(self, key: str):
+        db = await self._conn()
+        async with db.execute(
+            "SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return None if row is None else json.loads(row[0])
+
+    async def set(self, key: str, value, ttl: float = None):
+        db = await self._conn()
+        now = time.time()
+        await self._maybe_sweep(db, now)
+        await db.execute(
+            "INSERT INTO shared_state (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, json.dumps(value), expiry(ttl)),
+        )
+
+    async def add(self, key: str, value, ttl: float = None) -> bool:
+        db = await self._conn()
+        now = time.time()
+        await self._maybe_sweep(db, now)
+        # The conflict branch only overwrites an expired entry; otherwise no row changes
+        cursor = await db.execute(
+            "INSERT INTO shared_state (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE shared_state.expires_at IS NOT NULL AND shared_state.expires_at <= ?",
+            (key, json.dumps(value), expiry(ttl), now),
+        )
+        changed = cursor.rowcount
+        await cursor.close()
+        return changed == 1
+
+    async def delete(self, key: str):
+        db = await self._conn()
+        await db.execute("DELETE FROM shared_state WHERE key = ?", (key,))
+
+    async def incr(self, key: str, amount: int = 1, ttl: float = None) -> int:
+        db = await self._conn()
+        now = time.time()
+        await self._maybe_sweep(db, now)
+        # SET expressions all see the old row, so both CASEs agree on "expired"
+        async with db.execute(
+            "INSERT INTO shared_state (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN shared_state.expires_at <= ? THEN excluded.value "
+            "ELSE CAST(shared_state.value AS INTEGER) + CAST(excluded.value AS INTEGER) END, "
+            "expires_at = CASE WHEN shared_state.expires_at <= ? THEN excluded.expires_at "
+            "ELSE shared_state.expires_at END "
+            "RETURNING value",
+            (key, str(amount), expiry(ttl), now, now),
+        ) as cursor:
+            row = await cursor.fetchone()
+        return int(row[0])
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+class RedisSharedState(SharedState):
+    """Remote backend on redis-py's asyncio client (optional dependency)."""
+
+    # INCRBY and the first-increment PEXPIRE in one atomic step
+    INCR_SCRIPT = """
+        local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+        if value == tonumber(ARGV[1]) and tonumber(ARGV[2]) > 0 then
+            redis.call('PEXPIRE', KEYS[1], ARGV[2])
+        end
+        return value
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._incr = self._client.register_script(self.INCR_SCRIPT)
+
+    @staticmethod
+    def _px(ttl: float = None):
+        return None if ttl is None else max(1, int(ttl * 1000))
+
+    async def get(self, key: str):
+        value = await self._client.get(key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, key: str, value, ttl: float = None):
+        await self._client.set(key, json.dumps(value), px=self._px(ttl))
+
+    async def add(self, key: str, value, ttl: float = None) -> bool:
+        return bool(await self._client.set(key, json.dumps(value), px=self._px(ttl), nx=True))
+
+    async def delete(self, key: str):
+        await self._client.delete(key)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float = None) -> int:
+        return int(await self._incr(keys=[key], args=[amount, self._px(ttl) or 0]))
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def open_sqlite(url: str) -> SharedState:
+    # sqlite:///relative.db or sqlite:////absolute/path.db, as in DATABASE_URL
+    return SQLiteSharedState(url.split("sqlite:///", 1)[1])
+
+
+BACKENDS = {
+    "memory": lambda url: InMemorySharedState(),
+    "sqlite": open_sqlite,
+    "redis": RedisSharedState,
+    "rediss": RedisSharedState,
+}
+
+
+def register_backend(scheme: str, factory):
+    """Make `factory(url) -> SharedState` available for SHARED_STATE_URL=<scheme>://..."""
+    BACKENDS[scheme] = factory
+
+
+def open_shared_state(url: str) -> SharedState:
+    scheme = urlparse(url).scheme
+    if scheme not in BACKENDS:
+        raise ValueError(f"Unknown shared state backend {scheme!r}; expected one of {sorted(BACKENDS)}")
+    return BACKENDS[scheme](url)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+One-time migration: add users.email_normalized, fill it in chunks and index it.
+
+Safe to re-run and to interrupt: only rows with a NULL email_normalized are
+touched, each chunk commits on its own, and the unique index is created
+last (after every row has a value). Rows whose normalized emails collide are
+left NULL and reported; merge those accounts by hand and re-run.
+
+    python backfill_email_normalized.py --chunk-size 5000
+"""
+import argparse
+import time
+from sqlalchemy import bindparam, func, inspect, select, text, update
+from sqlalchemy.exc import IntegrityError
+from app.db import engine
+from app.models import User
+from app.utils.normalize import normalize_email
+
+def ensure_column():
+    columns = {c["name"] for c in inspect(engine).get_columns("users")}
+    if "email_normalized" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE users ADD COLUMN email_normalized VARCHAR"))
+        print("✅ Added users.email_normalized")
+
+def ensure_index():
+    for index in User.__table__.indexes:
+        if index.name == "ix_users_email_normalized":
+            index.create(bind=engine, checkfirst=True)
+    print("✅ Unique index ix_users_email_normalized is in place")
+
+def backfill(chunk_size: int):
+    stmt = (
+        update(User.__table__)
+        .where(User.__table__.c.id == bindparam("row_id"))
+        .values(email_normalized=bindparam("normalized"))
+    )
+    last_id = 0
+    done = 0
+    conflicts = []
+    start = time.perf_counter()
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(User.id, User.email)
+                .where(User.id > last_id, User.email_normalized.is_(None))
+                .order_by(User.id)
+                .limit(chunk_size)
+            ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = [{"row_id": row.id, "normalized": normalize_email(row.email)} for row in rows]
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt, params)
+        except IntegrityError:
+            # Some row in this chunk collides with an existing normalized email;
+            # apply the chunk row by row so only the duplicates are skipped
+            for param in params:
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(stmt, [param])
+                except IntegrityError:
+                    conflicts.append(param)
+        done += len(rows)
+        elapsed = time.perf_counter() - start
+        print(f"  {done} rows (last id {last_id}), {done / elapsed:.0f} rows/sec")
+
+    for param in conflicts:
+        print(f"⚠️  User {param['row_id']} duplicates normalized email {param['normalized']}")
+    return done, conflicts
+
+def find_duplicates():
+    """Normalized emails shared by several users (possible before the index exists)."""
+    with engine.connect() as conn:
+        return conn.execute(
+            select(User.email_normalized, func.count())
+            .where(User.email_normalized.is_not(None))
+            .group_by(User.email_normalized)
+            .having(func.count() > 1)
+        ).all()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill users.email_normalized")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    ensure_column()
+    done, conflicts = backfill(args.chunk_size)
+    print(f"✅ Backfilled {done} users")
+    duplicates = find_duplicates()
+    for email, count in duplicates:
+        print(f"⚠️  {count} users share normalized email {email}")
+    if conflicts or duplicates:
+        print("❌ Merge the duplicate accounts and re-run before the unique index can be created")
+    else:
+        ensure_index()
@@ -0,0 +1,111 @@
+"""
+p50/p99 latency of N concurrent /auth/me calls, blocking vs async DB layer.
+
+"sync" mounts the pre-async handler (a blocking `Session.query(...).first()`
+inside `async def`), "async" drives the real app. Point --database-url at a
+networked Postgres to see the effect of real round-trips; SQLite only gives
+a lower bound because its queries never leave the process.
+
+    pip install -r requirements-dev.txt
+    python -m benchmarks.bench_auth_me --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import configure_database, print_table, summarize
+
+
+def build_sync_app():
+    """The /auth/me handler as it was before the async port."""
+    import jwt
+    from fastapi import FastAPI, HTTPException, Request
+    from app.db import SessionLocal
+    from app.models import User
+    from app.services.auth_service import ALGORITHM, SECRET_KEY
+
+    sync_app = FastAPI()
+
+    @sync_app.get("/auth/me")
+    async def me(request: Request):
+        payload = jwt.decode(request.cookies["access_token"], SECRET_KEY, algorithms=[ALGORITHM])
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.email == payload["email"].lower()).first()
+        finally:
+            db.close()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return {"user": {"id": user.id, "name": user.name, "email": user.email}}
+
+    return sync_app
+
+
+async def seed_user(email: str) -> str:
+    from app.db import AsyncSessionLocal, Base, async_engine
+    from app.models import User
+    from app.services.auth_service import create_access_token, get_user_by_email
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        if not await get_user_by_email(db, email):
+            db.add(User(email=email, name="Bench User", password="x", is_verified=True))
+            await db.commit()
+    return create_access_token({"email": email})
+
+
+async def drive(asgi_app, token: str, total: int, concurrency: int) -> dict:
+    import httpx
+
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 cookies={"access_token": token}) as client:
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                res = await client.get("/auth/me")
+                latencies.append(time.perf_counter() - start)
+                res.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, elapsed)
+
+
+async def main(args):
+    from app.main import app
+
+    token = await seed_user("bench@jobvision.ai")
+    modes = {"sync": build_sync_app(), "async": app}
+    results = {}
+    for name in args.modes:
+        # One short warm-up pass so connection setup is not measured
+        await drive(modes[name], token, args.concurrency, args.concurrency)
+        results[name] = await drive(modes[name], token, args.requests, args.concurrency)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
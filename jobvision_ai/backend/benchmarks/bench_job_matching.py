@@ -0,0 +1,130 @@
+"""
+Skill-overlap scoring: NumPy vs a per-posting Python loop, plus /jobs/matches.
+
+Scores one applicant against --postings synthetic postings with
+app.utils.skill_match and with the straightforward loop it replaces (same
+weights, same result), then ingests the postings into --mongo-url (the
+benchmarks/memory_mongo.py stand-in by default) and measures match_jobs end to end against
+MATCH_BUDGET_MS.
+
+    python -m benchmarks.bench_job_matching --postings 5000 --repeat 50
+    python -m benchmarks.bench_job_matching --mongo-url mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_database, configure_mongo, print_table, summarize
+
+SKILLS = [f"skill-{i}" for i in range(400)]
+
+
+def synthetic_postings(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    # Zipf-ish popularity: a few skills appear everywhere, most are niche
+    weights = [1 / (rank + 1) for rank in range(len(SKILLS))]
+    return [sorted(set(rng.choices(SKILLS, weights, k=rng.randint(3, 12)))) for _ in range(count)]
+
+
+def score_python(applicant_skills, postings_skills) -> list:
+    count = len(postings_skills)
+    document_frequency = Counter(skill for skills in postings_skills for skill in skills)
+    weight = lambda skill: math.log1p(count / max(document_frequency.get(skill, 0), 1))
+    applicant = set(applicant_skills)
+    applicant_weight = sum(weight(skill) for skill in applicant)
+    scores = []
+    for skills in postings_skills:
+        shared = sum(weight(skill) for skill in skills if skill in applicant)
+        union = sum(weight(skill) for skill in skills) + applicant_weight - shared
+        scores.append(shared / union if union else 0.0)
+    return scores
+
+
+def timed_runs(fn, repeat: int) -> list:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def bench_endpoint(postings: list, applicant: list, repeat: int) -> dict:
+    from app.mongo import JOBS_COLLECTION, PROFILES_COLLECTION, ensure_indexes, mongo_db
+    from app.schemas import ApplicantProfileIn, JobIn
+    from app.services.jobs_service import ingest_jobs, match_jobs, upsert_profile
+
+    db = mongo_db()
+    await ensure_indexes(db)
+    now = datetime.now(timezone.utc)
+    jobs = [
+        JobIn(id=f"bench-{i:06d}", title=f"Role {i}", company=f"Company {i % 50}", skills=skills,
+              posted_at=now - timedelta(minutes=i))
+        for i, skills in enumerate(postings)
+    ]
+    await db[JOBS_COLLECTION].delete_many({"_id": {"$in": [job.id for job in jobs]}})
+    start = time.perf_counter()
+    await ingest_jobs(db, jobs)
+    ingest_s = time.perf_counter() - start
+    await upsert_profile(db, -1, ApplicantProfileIn(skills=applicant))
+
+    latencies, truncated, scored = [], 0, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await match_jobs(db, -1, 20)
+        latencies.append(time.perf_counter() - start)
+        truncated += result["truncated"]
+        scored = result["candidates_scored"]
+    await db[PROFILES_COLLECTION].delete_many({"_id": -1})
+    return {"latencies": latencies, "truncated": truncated, "scored": scored,
+            "ingest_rps": round(len(jobs) / ingest_s, 1)}
+
+
+def main(args):
+    configure_database(None)
+    configure_mongo(args.mongo_url)
+    from app.services.jobs_service import MATCH_BUDGET_MS
+    from app.utils.skill_match import score_skill_overlap
+
+    postings = synthetic_postings(args.postings)
+    applicant = ["skill-0", "skill-3", "skill-17", "skill-42", "skill-120", "skill-311"]
+
+    vectorized = score_skill_overlap(applicant, postings)
+    looped = score_python(applicant, postings)
+    agree = all(abs(a - b) < 1e-4 for a, b in zip(vectorized.tolist(), looped))
+
+    rows = {
+        "numpy scoring": summarize(timed_runs(lambda: score_skill_overlap(applicant, postings), args.repeat), 1),
+        "python loop": summarize(timed_runs(lambda: score_python(applicant, postings), args.repeat), 1),
+    }
+    endpoint = asyncio.run(bench_endpoint(postings, applicant, args.repeat))
+    rows["match_jobs end to end"] = summarize(endpoint["latencies"], 1)
+    for summary in rows.values():
+        summary.pop("throughput_rps")
+
+    if args.json:
+        print(json.dumps({"rows": rows, "scores_agree": agree, **{k: v for k, v in endpoint.items()
+                                                                 if k != "latencies"}}, indent=2))
+        return
+    print(f"{args.postings} postings, {args.repeat} runs, budget {MATCH_BUDGET_MS:.0f} ms, "
+          f"mongo: {os.environ['MONGO_URL']}\n")
+    print_table(rows)
+    speedup = rows["python loop"]["p50_ms"] / max(rows["numpy scoring"]["p50_ms"], 1e-6)
+    print(f"\nscores agree: {agree}; numpy is {speedup:.1f}x faster at p50")
+    print(f"end to end: {endpoint['scored']} candidates scored, {endpoint['truncated']}/{args.repeat} runs truncated "
+          f"by the budget; ingest {endpoint['ingest_rps']} postings/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--postings", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--mongo-url", default="memory://")
+    parser.add_argument("--json", action="store_true")
+    main(parser.parse_args())
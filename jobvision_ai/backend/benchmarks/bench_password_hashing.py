@@ -0,0 +1,80 @@
+"""
+Login throughput (password verifications/sec) per process-pool size.
+
+Each row verifies --logins bcrypt hashes concurrently through a
+PasswordHasher with that many workers and reports logins/sec in total and
+per worker core. "inline" is the old behaviour: verifying on the event loop.
+
+    python -m benchmarks.bench_password_hashing --rounds 12 --logins 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import print_table
+
+
+async def run_pool(workers: int, logins: int, password: str, hashed: str) -> dict:
+    from app.services.password_service import PasswordHasher
+
+    hasher = PasswordHasher(workers=workers, queue_size=logins)
+    try:
+        # Warm the pool so process start-up is not counted
+        await asyncio.gather(*(hasher.verify(password, hashed) for _ in range(workers)))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(hasher.verify(password, hashed) for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+    finally:
+        hasher.shutdown()
+    assert all(results)
+    return {
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_sec": round(logins / elapsed, 1),
+        "per_core": round(logins / elapsed / workers, 1),
+    }
+
+
+def run_inline(logins: int, password: str, hashed: str) -> dict:
+    from app.utils.security import verify_password
+
+    start = time.perf_counter()
+    for _ in range(logins):
+        assert verify_password(password, hashed)
+    elapsed = time.perf_counter() - start
+    return {
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_sec": round(logins / elapsed, 1),
+        "per_core": round(logins / elapsed, 1),
+    }
+
+
+async def main(args):
+    from app.utils.security import hash_password
+
+    password = "correct horse battery staple"
+    hashed = hash_password(password)
+    results = {"inline": run_inline(args.logins, password, hashed)}
+    for workers in args.workers:
+        results[f"pool x{workers}"] = await run_pool(workers, args.logins, password, hashed)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, max(1, cores // 2), cores}))
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    asyncio.run(main(args))
@@ -0,0 +1,80 @@
+"""
+Per-request overhead of the auth rate limiter.
+
+Times `RateLimiter.check` (an IP bucket plus an email bucket, as on
+/auth/login) against an in-memory store already tracking --keys buckets,
+and the idle-key sweep: one chunk (the longest the background sweep holds
+the event loop) and a full sweep for comparison.
+
+    python -m benchmarks.bench_rate_limiter --keys 100000 --checks 200000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import print_table
+
+
+class FakeRequest:
+    def __init__(self, ip: str):
+        self.client = type("Client", (), {"host": ip})()
+        self.headers = {}
+
+
+async def main(args):
+    from app.services.rate_limiter import RateLimiter, parse_limit
+    from app.utils.rate_limit import InMemoryRateLimitStore
+
+    store = InMemoryRateLimitStore(sweep_interval=3600)
+    limits = {("login", "ip"): parse_limit("1000000/60"), ("login", "email"): parse_limit("1000000/60")}
+    limiter = RateLimiter(store=store, limits=limits, enabled=True)
+
+    requests = [FakeRequest(f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}") for i in range(args.keys)]
+    emails = [f"user{i}@jobvision.ai" for i in range(args.keys)]
+    for request, email in zip(requests, emails):
+        await limiter.check("login", request, email)
+
+    results = {}
+    start = time.perf_counter()
+    for i in range(args.checks):
+        await limiter.check("login", requests[i % args.keys], emails[i % args.keys])
+    elapsed = time.perf_counter() - start
+    results["check (ip + email)"] = {
+        "calls": args.checks,
+        "us_per_call": round(elapsed / args.checks * 1e6, 3),
+        "keys": len(store),
+    }
+
+    # Far enough in the future that every bucket has refilled
+    future = time.monotonic() + 3600
+    chunk = [f"rl:login:email:{email}" for email in emails[:store.sweep_chunk]]
+    start = time.perf_counter()
+    dropped = store.sweep(now=future, keys=chunk)
+    results["sweep (one chunk)"] = {
+        "calls": 1,
+        "us_per_call": round((time.perf_counter() - start) * 1e6, 3),
+        "keys": dropped,
+    }
+
+    start = time.perf_counter()
+    dropped = store.sweep(now=future)
+    results["sweep (all keys)"] = {
+        "calls": 1,
+        "us_per_call": round((time.perf_counter() - start) * 1e6, 3),
+        "keys": dropped,
+    }
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--keys", type=int, default=100_000, help="distinct IPs/emails being tracked")
+    parser.add_argument("--checks", type=int, default=200_000)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    asyncio.run(main(args))
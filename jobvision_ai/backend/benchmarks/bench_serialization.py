@@ -0,0 +1,164 @@
+"""
+Serialization cost per response for the user profile endpoints.
+
+Drives minimal FastAPI apps through raw ASGI calls (no HTTP client, no DB),
+so the only thing that differs between rows is how the body is built and
+encoded:
+
+  dict_jsonable       hand-built dict, no response_model: jsonable_encoder +
+                      json.dumps (how every auth route worked before)
+  model_dump_json     response_model=UserResponse: validated and encoded to
+                      bytes by pydantic-core (the routes now)
+  model_orjson_class  the same model with an orjson default_response_class,
+                      which makes FastAPI skip its dump_json fast path
+  cached_orjson       prebuilt profile dict returned as FastJSONResponse
+                      (the conditional /auth/me path on a cache hit)
+
+Also reports the cost of building a profile from an ORM row by hand vs
+UserProfile.model_validate.
+
+    python -m benchmarks.bench_serialization --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import configure_database, print_table, summarize
+
+
+def legacy_profile(user) -> dict:
+    """serialize_user before the response models."""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "is_verified": user.is_verified,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+        "version": user.version,
+    }
+
+
+def build_apps(user, profile):
+    from fastapi import FastAPI
+    from app.schemas import UserResponse
+    from app.utils.responses import FastJSONResponse
+
+    apps = {}
+
+    dict_app = FastAPI()
+
+    @dict_app.get("/me")
+    async def me_dict():
+        return {"user": legacy_profile(user)}
+    apps["dict_jsonable"] = dict_app
+
+    model_app = FastAPI()
+
+    @model_app.get("/me", response_model=UserResponse)
+    async def me_model():
+        return {"user": profile}
+    apps["model_dump_json"] = model_app
+
+    orjson_app = FastAPI(default_response_class=FastJSONResponse)
+
+    @orjson_app.get("/me", response_model=UserResponse)
+    async def me_orjson():
+        return {"user": profile}
+    apps["model_orjson_class"] = orjson_app
+
+    cached_app = FastAPI()
+
+    @cached_app.get("/me")
+    async def me_cached():
+        return FastJSONResponse({"user": profile})
+    apps["cached_orjson"] = cached_app
+    return apps
+
+
+async def call(app, scope: dict) -> bytes:
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def time_app(app, requests: int):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/me", "raw_path": b"/me", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    for _ in range(min(200, requests)):
+        await call(app, scope)
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        t = time.perf_counter()
+        await call(app, scope)
+        latencies.append(time.perf_counter() - t)
+    return latencies, time.perf_counter() - start, await call(app, scope)
+
+
+def time_builder(fn, user, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(user)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+async def main(args):
+    configure_database(None)
+    from app.models import User
+    from app.schemas import UserProfile
+    from app.utils.responses import orjson
+
+    now = datetime.now(timezone.utc)
+    user = User(id=42, name="Bench User", email="bench@jobvision.ai", is_verified=True,
+                created_at=now, updated_at=now, version=3)
+    profile = UserProfile.model_validate(user).model_dump(mode="json")
+
+    rows, bodies = {}, {}
+    for name, app in build_apps(user, profile).items():
+        latencies, elapsed, body = await time_app(app, args.requests)
+        summary = summarize(latencies, elapsed)
+        rows[name] = {"mean_us": round(summary["mean_ms"] * 1000, 1),
+                      "p50_us": round(summary["p50_ms"] * 1000, 1),
+                      "p99_us": round(summary["p99_ms"] * 1000, 1)}
+        bodies[name] = json.loads(body)
+
+    # Every variant must produce the same fields (datetimes may differ in
+    # offset notation: isoformat writes +00:00, pydantic writes Z)
+    reference = bodies["model_dump_json"]["user"]
+    for name, body in bodies.items():
+        rows[name]["same_fields"] = sorted(body["user"]) == sorted(reference) and body["user"]["id"] == reference["id"]
+
+    builders = {
+        "build_dict_by_hand": {"per_call_us": round(time_builder(legacy_profile, user, args.requests), 2)},
+        "build_model_validate": {"per_call_us": round(time_builder(
+            lambda u: UserProfile.model_validate(u).model_dump(mode="json"), user, args.requests), 2)},
+    }
+
+    if args.json:
+        print(json.dumps({"responses": rows, "builders": builders, "orjson": orjson is not None}, indent=2))
+        return
+    print(f"{args.requests} requests per variant, orjson {'available' if orjson else 'not installed'}\n")
+    print_table(rows)
+    print()
+    print_table(builders)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--json", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,123 @@
+"""
+Cold-start cost of a backend worker: imports, lifespan startup, first requests.
+
+Each repeat starts a fresh interpreter with `-X importtime`, imports
+app.main, runs the lifespan and sends the first and second request to a few
+endpoints. Reports median import time per app module (cumulative, i.e.
+including what it pulls in), the heaviest third-party packages (self time
+summed over their modules) and the startup timeline. Regressions show up as
+a new heavy package or a jump in a module's cumulative time.
+
+    pip install -r requirements-dev.txt
+    python -m benchmarks.bench_startup --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from benchmarks.common import BACKEND_DIR, configure_database, print_table
+
+# Runs inside the child interpreter
+PROBE = r"""
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def main():
+    import httpx
+    timings = {"import_app_ms": (imported - start) * 1000}
+    from app.db import Base, engine
+    Base.metadata.create_all(bind=engine)
+    t = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings["lifespan_startup_ms"] = (time.perf_counter() - t) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, method, path, body in [
+                ("live", "GET", "/health/live", None),
+                ("ready", "GET", "/health/ready", None),
+                ("me", "GET", "/auth/me", None),
+                ("login", "POST", "/auth/login", {"email": "nobody@bench.io", "password": "x"}),
+            ]:
+                for attempt in ("first", "second"):
+                    t = time.perf_counter()
+                    await client.request(method, path, json=body)
+                    timings[f"{name}_{attempt}_ms"] = (time.perf_counter() - t) * 1000
+    timings["ready_total_ms"] = timings["import_app_ms"] + timings["lifespan_startup_ms"]
+    print(json.dumps(timings))
+
+asyncio.run(main())
+"""
+
+
+def parse_importtime(stderr: str):
+    """-> ({app module: cumulative us}, {top-level package: summed self us})"""
+    app_modules, packages = {}, defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if name.startswith("app.") or name == "app":
+            app_modules[name] = int(cumulative_us)
+        else:
+            packages[name.split(".")[0]] += int(self_us)
+    return app_modules, packages
+
+
+def run_once(env: dict):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    app_modules, packages = parse_importtime(result.stderr)
+    return timings, app_modules, packages
+
+
+def median_of(samples: list) -> dict:
+    keys = {key for sample in samples for key in sample}
+    return {key: statistics.median(sample.get(key, 0) for sample in samples) for key in keys}
+
+
+def main(args):
+    configure_database(args.database_url)
+    env = dict(os.environ, OUTBOX_WORKER_ENABLED="false", RATE_LIMIT_ENABLED="false", PYTHONPATH=BACKEND_DIR)
+
+    runs = [run_once(env) for _ in range(args.repeats)]
+    timings = median_of([run[0] for run in runs])
+    app_modules = median_of([run[1] for run in runs])
+    packages = median_of([run[2] for run in runs])
+
+    modules_table = {
+        name: {"cumulative_ms": round(us / 1000, 1)}
+        for name, us in sorted(app_modules.items(), key=lambda item: -item[1])
+    }
+    packages_table = {
+        name: {"self_ms": round(us / 1000, 1)}
+        for name, us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]
+    }
+    timeline = {name: {"ms": round(value, 1)} for name, value in sorted(timings.items())}
+
+    if args.json:
+        print(json.dumps({"timeline": timeline, "app_modules": modules_table, "packages": packages_table}, indent=2))
+        return
+    print(f"Median of {args.repeats} cold starts\n")
+    print_table(timeline)
+    print()
+    print_table(modules_table)
+    print()
+    print_table(packages_table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="third-party packages to list")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--json", action="store_true")
+    main(parser.parse_args())
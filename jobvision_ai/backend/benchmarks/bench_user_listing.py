@@ -0,0 +1,100 @@
+"""
+Admin user listing: page latency at increasing depth, keyset vs OFFSET.
+
+Seeds --rows users, then fetches one page at several depths both with the
+keyset cursor used by /admin/users and with a plain LIMIT/OFFSET query.
+Keyset latency should stay flat while OFFSET grows with depth.
+
+    python -m benchmarks.bench_user_listing --rows 200000 --page-size 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_database, print_table
+
+
+def seed(rows: int):
+    from sqlalchemy import func, insert, select
+    from app.db import Base, engine
+    from app.models import User
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(User)).scalar()
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        batch = []
+        for i in range(existing, rows):
+            batch.append({
+                "name": f"User {i}",
+                "email": f"user{i}@bench.jobvision.ai",
+                "email_normalized": f"user{i}@bench.jobvision.ai",
+                "password": "x",
+                "is_verified": i % 3 != 0,
+                # Several users per second so created_at ties are exercised
+                "created_at": start + timedelta(seconds=i // 4),
+            })
+            if len(batch) == 10_000:
+                conn.execute(insert(User), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(User), batch)
+
+
+async def time_page(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return round(sorted(samples)[len(samples) // 2] * 1000, 3)
+
+
+async def main(args):
+    from app.db import AsyncSessionLocal
+    from app.models import User
+    from app.services.admin_service import encode_cursor, filtered_users, list_users
+
+    seed(args.rows)
+    depths = sorted({0, args.rows // 10, args.rows // 2, max(0, args.rows - args.page_size * 2)})
+    results = {}
+    async with AsyncSessionLocal() as db:
+        for depth in depths:
+            cursor = None
+            if depth:
+                # Cursor of the row just before this depth, as a client would hold it
+                row = (await db.execute(
+                    filtered_users([User.created_at, User.id]).offset(depth - 1).limit(1)
+                )).one()
+                cursor = encode_cursor(row.created_at, row.id)
+
+            async def keyset():
+                await list_users(db, args.page_size, cursor)
+
+            async def offset():
+                result = await db.execute(filtered_users([User]).offset(depth).limit(args.page_size))
+                result.scalars().all()
+
+            results[f"depth {depth}"] = {
+                "keyset_ms": await time_page(keyset, args.repeats),
+                "offset_ms": await time_page(offset, args.repeats),
+            }
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    configure_database(args.database_url)
+    asyncio.run(main(args))
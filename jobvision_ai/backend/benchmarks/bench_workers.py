@@ -0,0 +1,167 @@
+"""
+Throughput of serve.py as the worker count grows.
+
+For each --workers value, starts `serve.py` on a free port, waits for
+/health/ready, logs one user in and then drives GET /auth/me from
+--clients load-generator processes for --duration seconds. Requests per
+second should grow roughly with the worker count until the cores are used
+up; the load generators need cores too, so run this on a machine with at
+least workers + clients cores for clean numbers.
+
+    pip install -r requirements-dev.txt
+    python -m benchmarks.bench_workers --workers 1,2,4 --clients 4 --duration 10
+    python -m benchmarks.bench_workers --shared-state sqlite   # same, with SHARED_STATE_URL
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import BACKEND_DIR, configure_database, percentile, print_table
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 60):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{base_url} did not become ready within {timeout}s")
+
+
+async def login(base_url: str) -> str:
+    import httpx
+
+    credentials = {"email": "workers@bench.jobvision.ai", "password": "Password123!"}
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        await client.post("/auth/register", json={**credentials, "name": "Bench"})
+        response = await client.post("/auth/login", json=credentials)
+        response.raise_for_status()
+        return response.cookies["access_token"]
+
+
+def client_process(base_url: str, token: str, concurrency: int, duration: float, results):
+    import httpx
+
+    async def run():
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits,
+                                     headers={"Cookie": f"access_token={token}"}) as client:
+            async def user():
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await client.get("/auth/me")
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+            await asyncio.gather(*(user() for _ in range(concurrency)))
+        return latencies, errors
+
+    results.put(asyncio.run(run()))
+
+
+def drive(base_url: str, token: str, clients: int, concurrency: int, duration: float):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=client_process, args=(base_url, token, concurrency, duration, results))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    latencies = [latency for batch, _ in collected for latency in batch]
+    errors = sum(batch_errors for _, batch_errors in collected)
+    return latencies, errors, elapsed
+
+
+async def bench_workers(workers: int, args, env: dict) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(workers, port, env)
+    try:
+        await wait_ready(base_url)
+        token = await login(base_url)
+        latencies, errors, elapsed = drive(base_url, token, args.clients, args.concurrency, args.duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=args.duration + 30)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def main(args):
+    database_url = configure_database(args.database_url)
+    from init_db import init_database
+
+    init_database()
+    env = dict(os.environ, DATABASE_URL=database_url, EMAIL_TRANSPORT="memory", OUTBOX_WORKER_ENABLED="false",
+               RATE_LIMIT_ENABLED="false", BCRYPT_ROUNDS="4", PYTHONPATH=BACKEND_DIR)
+    if args.shared_state == "sqlite":
+        env["SHARED_STATE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobvision-state-'), 'state.db')}"
+    elif args.shared_state:
+        env["SHARED_STATE_URL"] = args.shared_state
+
+    rows = {}
+    for workers in [int(w) for w in args.workers.split(",")]:
+        rows[f"{workers} worker(s)"] = await bench_workers(workers, args, env)
+    baseline = next(iter(rows.values()))["throughput_rps"] or 1
+    for summary in rows.values():
+        summary["speedup"] = round(summary["throughput_rps"] / baseline, 2)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{os.cpu_count()} CPU(s), {args.clients} client processes x {args.concurrency} connections, "
+          f"{args.duration:.0f}s per run, shared state: {env.get('SHARED_STATE_URL', 'off')}\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=4, help="load-generator processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="connections per client process")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--shared-state", default=None, help="'sqlite' or a SHARED_STATE_URL")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--json", action="store_true")
+    asyncio.run(main(parser.parse_args()))
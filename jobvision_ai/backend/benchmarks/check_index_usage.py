@@ -0,0 +1,100 @@
+"""
+EXPLAIN every user lookup path and fail if any of them scans the table.
+
+Runs against --database-url (a temporary SQLite file by default) after
+migrating the schema with init_db and adding a few rows. The temporary
+database first gets the secondary indexes dropped, as on a deployment
+created before they were declared, so the check also proves init_db adds
+them. On Postgres, sequential scans are
+disabled for the session so a tiny table cannot hide a missing index: if
+the plan still contains a Seq Scan, no usable index exists.
+
+    python -m benchmarks.check_index_usage --database-url postgresql://...
+"""
+import argparse
+import re
+import sys
+from datetime import datetime, timezone
+
+from benchmarks.common import configure_database
+
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN \w+\b(?! USING (COVERING )?INDEX)")
+
+
+def lookup_queries() -> dict:
+    from sqlalchemy import select, tuple_
+    from app.models import User
+    from app.services.admin_service import filtered_users
+    from app.services.auth_service import user_by_email_query, users_by_emails_query, users_by_ids_query
+
+    cursor = (datetime(2025, 1, 1, tzinfo=timezone.utc), 10)
+    return {
+        "get_user_by_email": user_by_email_query(" Someone@JobVision.ai "),
+        "fetch_user_by_id": select(User).where(User.id == 1),
+        "load_users_by_ids": users_by_ids_query([1, 2, 3]),
+        "load_users_by_emails": users_by_emails_query(["a@jobvision.ai", "b@jobvision.ai"]),
+        "admin_list_users": filtered_users([User])
+            .where(tuple_(User.created_at, User.id) < cursor)
+            .limit(51),
+    }
+
+
+def explain(conn, stmt) -> str:
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        return "\n".join(row[-1] for row in rows)
+    rows = conn.exec_driver_sql(f"EXPLAIN {compiled}", params).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def uses_table_scan(dialect: str, plan: str) -> bool:
+    if dialect == "sqlite":
+        return bool(SQLITE_FULL_SCAN.search(plan))
+    return "Seq Scan" in plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+    configure_database(args.database_url)
+
+    from app.db import Base, engine
+    from app.models import User
+    from init_db import init_database
+    from sqlalchemy.orm import Session
+
+    Base.metadata.create_all(bind=engine)
+    if not args.database_url:
+        for index in User.__table__.indexes:
+            if not index.unique:
+                index.drop(bind=engine, checkfirst=True)
+    init_database()
+    with Session(engine) as db:
+        if not db.query(User).first():
+            db.add_all([User(name=f"U{i}", email=f"u{i}@jobvision.ai", password="x") for i in range(20)])
+            db.commit()
+
+    failures = 0
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        for name, stmt in lookup_queries().items():
+            plan = explain(conn, stmt)
+            scan = uses_table_scan(conn.dialect.name, plan)
+            failures += scan
+            print(f"{'❌' if scan else '✅'} {name}")
+            print("    " + plan.replace("\n", "\n    "))
+
+    if failures:
+        print(f"\n❌ {failures} lookup path(s) fall back to a table scan")
+        sys.exit(1)
+    print("\n✅ Every lookup path is an index hit")
+
+
+if __name__ == "__main__":
+    main()
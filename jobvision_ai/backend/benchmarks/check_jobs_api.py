@@ -0,0 +1,214 @@
+"""
+Exercise the /jobs API end to end and fail on any broken guarantee.
+
+Runs the real app in process against --mongo-url and checks that bulk
+ingestion is idempotent, that cursor pagination neither repeats nor skips
+postings when many share a posted_at, that listings leave descriptions out,
+that the expected indexes exist and that /jobs/matches ranks the closest
+postings first. Against a real mongod it also EXPLAINs the listing and
+matching queries and fails on a collection scan or an in-memory sort; the
+default memory:// stand-in (benchmarks/memory_mongo.py) has no planner, so
+that part is skipped there.
+
+    pip install -r requirements-dev.txt
+    python -m benchmarks.check_jobs_api
+    python -m benchmarks.check_jobs_api --mongo-url mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import configure_database, configure_mongo
+
+ADMIN_KEY = "check-jobs-admin-key"
+BASE_TIME = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def postings(count: int) -> list:
+    # Groups of five share a posted_at so the cursor's _id tiebreak matters
+    stacks = [["python", "fastapi"], ["python", "django"], ["react", "typescript"], ["go", "kubernetes"]]
+    return [
+        {
+            "id": f"job-{i:05d}",
+            "title": f"Engineer {i}",
+            "company": f"Company {i % 7}",
+            "remote": i % 2 == 0,
+            "skills": stacks[i % len(stacks)] + ([" MongoDB "] if i % 10 == 0 else []),
+            "description": "x" * 500,
+            "posted_at": (BASE_TIME - timedelta(hours=i // 5)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def plan_stages(plan) -> set:
+    """Every stage name in an explain() plan, however deeply nested."""
+    stages = set()
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            stages |= plan_stages(item)
+    return stages
+
+
+async def plan_checks(check):
+    from app.mongo import JOBS_COLLECTION, mongo_db
+    from app.services.jobs_service import LISTING_ORDER, SKILLS_PROJECTION, SUMMARY_PROJECTION
+
+    keyset = {"posted_at": {"$lte": BASE_TIME}, "$or": [{"posted_at": {"$lt": BASE_TIME}}, {"_id": {"$lt": "job-00003"}}]}
+    queries = {
+        "listing page": (keyset, SUMMARY_PROJECTION),
+        "skill-filtered page": ({"skills": "python", **keyset}, SUMMARY_PROJECTION),
+        "match candidates": ({"skills": {"$in": ["fastapi", "mongodb", "python"]}}, SKILLS_PROJECTION),
+    }
+    jobs = mongo_db()[JOBS_COLLECTION]
+    for name, (query, projection) in queries.items():
+        plan = await jobs.find(query, projection).sort(LISTING_ORDER).limit(21).explain()
+        stages = plan_stages(plan["queryPlanner"]["winningPlan"])
+        check(f"{name} is an index scan without an in-memory sort",
+              "COLLSCAN" not in stages and "SORT" not in stages, ", ".join(sorted(stages)))
+
+
+async def checks(client, mailbox, real_server: bool) -> list:
+    from app.mongo import JOBS_COLLECTION, mongo_db
+
+    results = []
+
+    def check(name: str, ok: bool, detail: str = ""):
+        results.append((name, ok, detail))
+
+    jobs = postings(250)
+    admin = {"X-Admin-Key": ADMIN_KEY}
+    await mongo_db()[JOBS_COLLECTION].delete_many({"_id": {"$in": [job["id"] for job in jobs]}})
+
+    res = await client.post("/jobs/bulk", json={"jobs": jobs})
+    check("bulk ingest requires admin", res.status_code == 403, str(res.status_code))
+
+    first = (await client.post("/jobs/bulk", json={"jobs": jobs}, headers=admin)).json()
+    check("first ingest inserts everything", first == {"received": 250, "inserted": 250, "updated": 0, "unchanged": 0},
+          str(first))
+    again = (await client.post("/jobs/bulk", json={"jobs": jobs}, headers=admin)).json()
+    check("replayed ingest changes nothing", again == {"received": 250, "inserted": 0, "updated": 0, "unchanged": 250},
+          str(again))
+    edited = [dict(jobs[0], title="Senior Engineer 0")]
+    changed = (await client.post("/jobs/bulk", json={"jobs": edited}, headers=admin)).json()
+    check("edited posting counts as updated", changed["updated"] == 1, str(changed))
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/jobs", params=params)).json()
+        seen.extend(page["jobs"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor or pages > 100:
+            break
+    ids = [job["id"] for job in seen if job["id"].startswith("job-")]
+    expected = [job["id"] for job in sorted(jobs, key=lambda j: (j["posted_at"], j["id"]), reverse=True)]
+    check("pagination returns every posting once, newest first", ids == expected,
+          f"{len(ids)} ids over {pages} pages, {len(set(ids))} distinct")
+    check("listing omits descriptions", all("description" not in job for job in seen))
+    skills = {skill for job in seen for skill in job["skills"]}
+    check("skills are normalized on ingest", "mongodb" in skills and " MongoDB " not in skills, str(sorted(skills)))
+
+    bad = await client.get("/jobs", params={"cursor": "not-a-cursor"})
+    check("malformed cursor is a 400", bad.status_code == 400, str(bad.status_code))
+
+    filtered = (await client.get("/jobs", params={"skill": "Kubernetes", "limit": 100})).json()["jobs"]
+    check("skill filter", filtered and all("kubernetes" in job["skills"] for job in filtered), f"{len(filtered)} jobs")
+
+    detail = await client.get("/jobs/job-00000")
+    check("detail includes description and edits",
+          detail.status_code == 200 and detail.json()["description"] and detail.json()["title"] == "Senior Engineer 0")
+    missing = await client.get("/jobs/does-not-exist")
+    check("unknown job is a 404", missing.status_code == 404, str(missing.status_code))
+
+    indexes = await mongo_db()[JOBS_COLLECTION].index_information()
+    wanted = {"posted_at_id", "skills_posted_at_id", "company_posted_at_id"}
+    check("indexes created at startup", wanted <= set(indexes), str(sorted(indexes)))
+    if real_server:
+        await plan_checks(check)
+
+    # Applicant side
+    email, password = "jobs-check@jobvision.ai", "Password123!"
+    await client.post("/auth/register", json={"email": email, "name": "Jobs Check", "password": password})
+    code = await mailbox.code_for(email)
+    await client.post("/auth/verify", json={"email": email, "code": code})
+    login = await client.post("/auth/login", json={"email": email, "password": password})
+    headers = {"Cookie": f"access_token={login.cookies['access_token']}"}
+    client.cookies.clear()
+
+    res = await client.get("/jobs/matches", headers=headers)
+    check("matching without a profile is a 404", res.status_code == 404, str(res.status_code))
+    res = await client.get("/jobs/matches")
+    check("matching requires login", res.status_code == 401, str(res.status_code))
+
+    saved = await client.put("/jobs/profile", json={"skills": ["Python", "FastAPI", "MongoDB"]}, headers=headers)
+    check("profile saved", saved.status_code == 200 and saved.json()["skills"] == ["fastapi", "mongodb", "python"],
+          saved.text)
+    profile = (await client.get("/jobs/profile", headers=headers)).json()
+    check("profile read back", profile["skills"] == ["fastapi", "mongodb", "python"], str(profile))
+
+    result = (await client.get("/jobs/matches", params={"limit": 10}, headers=headers)).json()
+    matches = result["matches"]
+    scores = [match["score"] for match in matches]
+    check("matches sorted by score", scores == sorted(scores, reverse=True) and len(matches) == 10, str(scores))
+    check("best match shares every applicant skill",
+          bool(matches) and set(matches[0]["matched_skills"]) == {"python", "fastapi", "mongodb"},
+          str(matches[0]["matched_skills"] if matches else None))
+    overlapping = sum(1 for job in jobs if {"python", "fastapi", "mongodb"} & {s.strip().lower() for s in job["skills"]})
+    check("only overlapping postings are candidates", result["candidates_scored"] == overlapping,
+          f"{result['candidates_scored']} scored, {overlapping} overlap")
+    check("matches skip descriptions", all("description" not in match["job"] for match in matches))
+    return results
+
+
+async def run(args) -> list:
+    import httpx
+    from app.db import Base, async_engine
+    from app.main import app
+    from app.services.email_outbox import outbox_worker
+    from benchmarks.loadtest import FakeMailbox
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    mailbox = FakeMailbox()
+    outbox_worker.transport_factory = mailbox.transport
+    outbox_worker.poll_seconds = 0.05
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            return await checks(client, mailbox, real_server=not args.mongo_url.startswith("memory://"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mongo-url", default="memory://")
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    os.environ["MONGO_DB"] = os.getenv("MONGO_DB", "jobvision_check")
+    os.environ["ADMIN_API_KEY"] = ADMIN_KEY
+    os.environ["BCRYPT_ROUNDS"] = "4"
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    configure_database(args.database_url)
+    configure_mongo(args.mongo_url)
+
+    failed = 0
+    for name, ok, detail in asyncio.run(run(args)):
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if args.mongo_url.startswith("memory://"):
+        print("ℹ️  Query plans not checked: the memory stand-in has no planner (pass --mongo-url for a mongod)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against the real FastAPI app through an in-process ASGI
+client, so DATABASE_URL has to be set before anything under `app` is imported.
+That client is httpx, which only the dev requirements install:
+
+    pip install -r requirements-dev.txt
+"""
+import os
+import statistics
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def configure_database(database_url: str = None) -> str:
+    """
+    Point the app at a benchmark database (a throwaway SQLite file by default)
+    and make the backend importable when running `python benchmarks/x.py`.
+    """
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    if not database_url:
+        path = os.path.join(tempfile.mkdtemp(prefix="jobvision-bench-"), "bench.db")
+        database_url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    return database_url
+
+
+def configure_mongo(mongo_url: str) -> str:
+    """
+    Point the jobs subsystem at `mongo_url`. memory:// runs it against the
+    in-process stand-in in benchmarks/memory_mongo.py instead of motor.
+    Call after configure_database, which makes `app` importable.
+    """
+    os.environ["MONGO_URL"] = mongo_url
+    if mongo_url.startswith("memory://"):
+        import app.mongo
+        from benchmarks.memory_mongo import MemoryMongoClient
+
+        app.mongo.client_factory = MemoryMongoClient
+    return mongo_url
+
+
+def percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed: float) -> dict:
+    """Latencies are in seconds; the summary is reported in milliseconds."""
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+def print_table(rows: dict):
+    """Print {label: summary} as an aligned table."""
+    if not rows:
+        return
+    columns = list(next(iter(rows.values())).keys())
+    width = max(len(label) for label in rows) + 2
+    widths = [max(12, len(c) + 2) for c in columns]
+    print("".ljust(width) + "".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for label, summary in rows.items():
+        print(label.ljust(width) + "".join(str(summary[c]).rjust(w) for c, w in zip(columns, widths)))
@@ -0,0 +1,213 @@
+"""
+Load test for the auth API.
+
+Each virtual user runs register -> verify -> login -> me (xN) -> fetch-by-email
+against the FastAPI app through an in-process ASGI client. Verification
+codes are read from a fake mailer plugged into the outbox worker, so the
+email path is exercised without SMTP. Reports throughput, latency
+percentiles and DB statements per request for every step.
+
+    pip install -r requirements-dev.txt
+    python -m benchmarks.loadtest --users 200 --concurrency 20 --json run.json
+    python -m benchmarks.loadtest --users 200 --concurrency 20 --baseline run.json
+
+With --baseline the run is compared to an earlier JSON result and the
+script exits with status 1 if any step regressed by more than --threshold.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.common import configure_database, print_table, summarize
+
+STEPS = ["register", "verify", "login", "me", "fetch_by_email"]
+ROUTES = {
+    "register": "/auth/register",
+    "verify": "/auth/verify",
+    "login": "/auth/login",
+    "me": "/auth/me",
+    "fetch_by_email": "/auth/fetch-by-email",
+}
+CODE_PATTERN = re.compile(r"verification code is: (\w+)")
+
+
+class FakeMailbox:
+    """Outbox transport that hands each delivered code to the waiting flow."""
+
+    def __init__(self):
+        self._codes = defaultdict(asyncio.Future)
+
+    def transport(self):
+        mailbox = self
+
+        class Transport:
+            async def send(self, message):
+                code = CODE_PATTERN.search(message.get_content()).group(1)
+                future = mailbox._codes[message["To"]]
+                if not future.done():
+                    future.set_result(code)
+
+            async def close(self):
+                pass
+
+        return Transport()
+
+    async def code_for(self, email: str, timeout: float = 30) -> str:
+        return await asyncio.wait_for(asyncio.shield(self._codes[email]), timeout)
+
+
+def db_query_totals() -> dict:
+    from prometheus_client import REGISTRY
+
+    totals = {}
+    for step, route in ROUTES.items():
+        labels = {"route": route}
+        totals[step] = (
+            REGISTRY.get_sample_value("db_queries_per_request_sum", labels) or 0.0,
+            REGISTRY.get_sample_value("db_queries_per_request_count", labels) or 0.0,
+        )
+    return totals
+
+
+async def user_flow(client, mailbox, index: int, run_id: str, me_polls: int, latencies: dict):
+    email = f"load-{run_id}-{index}@jobvision.ai"
+    password = f"pw-{index}"
+
+    async def call(step, method, url, **kwargs):
+        start = time.perf_counter()
+        res = await client.request(method, url, **kwargs)
+        latencies[step].append(time.perf_counter() - start)
+        if res.status_code >= 400:
+            raise RuntimeError(f"{step} failed with {res.status_code}: {res.text}")
+        return res
+
+    await call("register", "POST", "/auth/register", json={"email": email, "name": f"Load {index}", "password": password})
+    code = await mailbox.code_for(email)
+    await call("verify", "POST", "/auth/verify", json={"email": email, "code": code})
+    res = await call("login", "POST", "/auth/login", json={"email": email, "password": password})
+    headers = {"Cookie": f"access_token={res.cookies['access_token']}"}
+    for _ in range(me_polls):
+        await call("me", "GET", "/auth/me", headers=headers)
+    await call("fetch_by_email", "POST", "/auth/fetch-by-email", json={"email": email})
+
+
+async def run(args) -> dict:
+    import httpx
+    from app.db import Base, async_engine
+    from app.main import app
+    from app.services.email_outbox import outbox_worker
+    from app.services.password_service import password_hasher
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    mailbox = FakeMailbox()
+    outbox_worker.transport_factory = mailbox.transport
+    outbox_worker.poll_seconds = 0.05
+    await outbox_worker.start()
+
+    latencies = defaultdict(list)
+    queries_before = db_query_totals()
+    run_id = str(int(time.time() * 1000))
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        async def bounded(index):
+            async with semaphore:
+                try:
+                    await user_flow(client, mailbox, index, run_id, args.me_polls, latencies)
+                except Exception as e:
+                    failures.append(str(e))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(i) for i in range(args.users)))
+        elapsed = time.perf_counter() - started
+
+    await outbox_worker.stop()
+    password_hasher.shutdown()
+
+    queries_after = db_query_totals()
+    steps = {}
+    for step in STEPS:
+        summary = summarize(latencies[step], elapsed)
+        query_sum = queries_after[step][0] - queries_before[step][0]
+        query_count = queries_after[step][1] - queries_before[step][1]
+        summary["db_queries_per_req"] = round(query_sum / query_count, 2) if query_count else 0.0
+        steps[step] = summary
+
+    total_requests = sum(len(v) for v in latencies.values())
+    return {
+        "config": {
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "me_polls": args.me_polls,
+            "bcrypt_rounds": args.rounds,
+            "database": args.database_url or "sqlite (temporary)",
+        },
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total_requests / elapsed, 1),
+        "failures": len(failures),
+        "first_failures": failures[:5],
+        "steps": steps,
+    }
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list:
+    """Return a list of human-readable regressions against the baseline."""
+    regressions = []
+    if result["throughput_rps"] < baseline["throughput_rps"] * (1 - threshold):
+        regressions.append(f"throughput {baseline['throughput_rps']} -> {result['throughput_rps']} req/s")
+    for step, summary in result["steps"].items():
+        before = baseline["steps"].get(step)
+        if not before:
+            continue
+        for metric in ("p50_ms", "p99_ms", "db_queries_per_req"):
+            if before[metric] and summary[metric] > before[metric] * (1 + threshold):
+                regressions.append(f"{step} {metric} {before[metric]} -> {summary[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--me-polls", type=int, default=5, help="/auth/me calls per user")
+    parser.add_argument("--rounds", type=int, default=4, help="bcrypt cost factor for the run")
+    parser.add_argument("--json", help="write the result to this file")
+    parser.add_argument("--baseline", help="earlier --json result to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression, 0.10 = 10%%")
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    # Every virtual user shares one client IP, which the auth throttles would block
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    configure_database(args.database_url)
+    result = asyncio.run(run(args))
+
+    print_table(result["steps"])
+    print(f"\n{result['throughput_rps']} req/s over {result['elapsed_s']} s, {result['failures']} failed flows")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
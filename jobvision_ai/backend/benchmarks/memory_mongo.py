@@ -0,0 +1,294 @@
+"""
+In-process stand-in for the parts of motor the jobs subsystem uses, for the
+jobs checks and benchmarks when no mongod is at hand (--mongo-url memory://).
+
+Same call shapes as AsyncIOMotorClient / database / collection / cursor for
+find (filter, projection, sort, limit, batch_size), find_one, update_one,
+bulk_write with pymongo UpdateOne, count_documents, delete_many and
+create_index, so the service code runs unchanged.
+Filters support equality (including array membership), $in, $nin, $ne,
+$lt/$lte/$gt/$gte, $all, $exists, $and and $or; updates support $set,
+$setOnInsert, $unset and $inc. Indexes are recorded but not used and there
+is no query planner, so index usage is only checked against a real server.
+"""
+import copy
+
+from bson import ObjectId
+
+
+# ----------------------
+# Query matching
+# ----------------------
+def _equals(value, target) -> bool:
+    if isinstance(value, list) and not isinstance(target, list):
+        return target in value
+    return value == target
+
+
+def _compare(value, target, op) -> bool:
+    values = value if isinstance(value, list) else [value]
+    for item in values:
+        if item is None:
+            continue
+        try:
+            if op(item, target):
+                return True
+        except TypeError:
+            continue
+    return False
+
+
+OPERATORS = {
+    "$eq": _equals,
+    "$ne": lambda value, target: not _equals(value, target),
+    "$in": lambda value, targets: any(_equals(value, target) for target in targets),
+    "$nin": lambda value, targets: not any(_equals(value, target) for target in targets),
+    "$lt": lambda value, target: _compare(value, target, lambda a, b: a < b),
+    "$lte": lambda value, target: _compare(value, target, lambda a, b: a <= b),
+    "$gt": lambda value, target: _compare(value, target, lambda a, b: a > b),
+    "$gte": lambda value, target: _compare(value, target, lambda a, b: a >= b),
+    "$all": lambda value, targets: isinstance(value, list) and all(target in value for target in targets),
+}
+
+
+def matches(doc: dict, query: dict) -> bool:
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            value = doc.get(key)
+            for op, argument in condition.items():
+                if op == "$exists":
+                    if (key in doc) != bool(argument):
+                        return False
+                elif not OPERATORS[op](value, argument):
+                    return False
+        elif not _equals(doc.get(key), condition):
+            return False
+    return True
+
+
+def project(doc: dict, projection) -> dict:
+    if not projection:
+        return copy.deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    include_id = projection.get("_id", 1)
+    fields = {field: flag for field, flag in projection.items() if field != "_id"}
+    if fields and all(fields.values()):
+        result = {field: copy.copy(doc[field]) for field in fields if field in doc}
+    else:
+        result = {field: copy.copy(value) for field, value in doc.items() if fields.get(field, 1)}
+        result.pop("_id", None)
+    if include_id and "_id" in doc:
+        result["_id"] = doc["_id"]
+    return result
+
+
+def sort_documents(docs: list, keys) -> list:
+    # Stable sorts applied last key first; missing values sort lowest, as in Mongo
+    for field, direction in reversed(keys):
+        docs.sort(key=lambda doc: (doc.get(field) is not None, doc.get(field)), reverse=direction < 0)
+    return docs
+
+
+# ----------------------
+# Updates
+# ----------------------
+def apply_update(doc: dict, update: dict, inserting: bool = False) -> dict:
+    updated = copy.deepcopy(doc)
+    for op, fields in update.items():
+        if op == "$set" or (op == "$setOnInsert" and inserting):
+            updated.update(copy.deepcopy(fields))
+        elif op == "$unset":
+            for field in fields:
+                updated.pop(field, None)
+        elif op == "$inc":
+            for field, amount in fields.items():
+                updated[field] = updated.get(field, 0) + amount
+        elif op != "$setOnInsert":
+            raise NotImplementedError(f"Update operator {op} is not supported by the memory stand-in")
+    return updated
+
+
+class UpdateResult:
+    def __init__(self, matched_count=0, modified_count=0, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class BulkWriteResult:
+    def __init__(self):
+        self.matched_count = 0
+        self.modified_count = 0
+        self.upserted_count = 0
+        self.upserted_ids = {}
+
+
+class DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+
+# ----------------------
+# Client objects
+# ----------------------
+class MemoryCursor:
+    def __init__(self, collection, query, projection):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort = []
+        self._limit = 0
+        self._results = None
+
+    def sort(self, key_or_list, direction: int = 1):
+        self._sort = [(key_or_list, direction)] if isinstance(key_or_list, str) else list(key_or_list)
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    def _materialize(self):
+        if self._results is None:
+            docs = [doc for doc in self._collection._docs.values() if matches(doc, self._query)]
+            docs = sort_documents(docs, self._sort)
+            if self._limit:
+                docs = docs[:self._limit]
+            self._results = iter([project(doc, self._projection) for doc in docs])
+        return self._results
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._materialize())
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        self._results = iter(())
+
+    async def to_list(self, length=None):
+        results = self._materialize()
+        if length is None:
+            return list(results)
+        return [doc for _, doc in zip(range(length), results)]
+
+
+class MemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self._docs = {}
+        self._indexes = {"_id_": [("_id", 1)]}
+
+    async def create_index(self, keys, name: str = None, **kwargs) -> str:
+        keys = [(keys, 1)] if isinstance(keys, str) else list(keys)
+        name = name or "_".join(f"{field}_{direction}" for field, direction in keys)
+        self._indexes[name] = keys
+        return name
+
+    async def index_information(self) -> dict:
+        return {name: {"key": keys} for name, keys in self._indexes.items()}
+
+    def find(self, filter=None, projection=None, sort=None, limit=0, batch_size=None):
+        cursor = MemoryCursor(self, filter or {}, projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.limit(limit)
+
+    async def find_one(self, filter=None, projection=None, sort=None):
+        results = await self.find(filter, projection, sort=sort, limit=1).to_list(1)
+        return results[0] if results else None
+
+    async def count_documents(self, filter=None) -> int:
+        return sum(1 for doc in self._docs.values() if matches(doc, filter or {}))
+
+    def _candidates(self, query: dict):
+        # Exact _id lookups skip the scan, like the _id index would
+        doc_id = query.get("_id")
+        if doc_id is not None and not isinstance(doc_id, dict):
+            return [(doc_id, self._docs[doc_id])] if doc_id in self._docs else []
+        return list(self._docs.items())
+
+    def _update(self, query: dict, update: dict, upsert: bool):
+        for doc_id, doc in self._candidates(query):
+            if matches(doc, query):
+                updated = apply_update(doc, update)
+                modified = updated != doc
+                self._docs[doc_id] = updated
+                return UpdateResult(1, int(modified))
+        if not upsert:
+            return UpdateResult()
+        seed = {key: value for key, value in query.items()
+                if not key.startswith("$") and not isinstance(value, dict)}
+        doc = apply_update(seed, update, inserting=True)
+        doc.setdefault("_id", ObjectId())
+        self._docs[doc["_id"]] = doc
+        return UpdateResult(upserted_id=doc["_id"])
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        return self._update(filter, update, upsert)
+
+    async def bulk_write(self, requests, ordered: bool = True) -> BulkWriteResult:
+        result = BulkWriteResult()
+        for index, request in enumerate(requests):
+            # pymongo.UpdateOne keeps its arguments in these attributes
+            outcome = self._update(request._filter, request._doc, request._upsert)
+            result.matched_count += outcome.matched_count
+            result.modified_count += outcome.modified_count
+            if outcome.upserted_id is not None:
+                result.upserted_count += 1
+                result.upserted_ids[index] = outcome.upserted_id
+        return result
+
+    async def delete_many(self, filter=None) -> DeleteResult:
+        doomed = [doc_id for doc_id, doc in self._docs.items() if matches(doc, filter or {})]
+        for doc_id in doomed:
+            del self._docs[doc_id]
+        return DeleteResult(len(doomed))
+
+
+class MemoryDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def command(self, command, *args, **kwargs):
+        if command == "ping":
+            return {"ok": 1.0}
+        raise NotImplementedError(f"Command {command!r} is not supported by the memory stand-in")
+
+
+class MemoryMongoClient:
+    def __init__(self, *args, **kwargs):
+        self._databases = {}
+        self.admin = MemoryDatabase("admin")
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    def close(self):
+        pass
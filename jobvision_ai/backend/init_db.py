@@ -1,19 +1,358 @@
 #!/usr/bin/env python3
 """
 Database initialization script
+
+    python init_db.py                                  # create tables
+    python init_db.py generate --count 1000000         # synthetic users
+    python init_db.py import users.csv --resume        # CSV or NDJSON
+
+Imports stream the source in batches: passwords for the next batch are
+hashed across CPU cores while the current batch is inserted (Postgres COPY,
+executemany elsewhere), and each batch commits on its own. Progress is
+written to a state file after every commit so an interrupted run picks up
+where it stopped with --resume.
+
+Import columns: email, name, and either password (plain text, hashed here)
+or password_hash (stored as-is); is_verified and created_at are optional.
 """
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert, inspect, select, text
+from sqlalchemy.exc import IntegrityError
 from app.db import engine, Base
-from app.models import User
+from app.models import User, VerificationCode
+from app.services.verification_codes import VERIFICATION_CODE_TTL_SECONDS, hash_code
+from app.utils import security
+from app.utils.normalize import normalize_email
+
+FIRST_NAMES = ["Abebe", "Sara", "Daniel", "Hana", "Yonas", "Meron", "Samuel", "Liya", "Dawit", "Ruth"]
+LAST_NAMES = ["Bekele", "Tesfaye", "Alemu", "Girma", "Haile", "Mekonnen", "Tadesse", "Kebede"]
+COPY_COLUMNS = ["name", "email", "email_normalized", "password", "is_verified", "created_at"]
+
+# Columns added to existing tables after their first release; create_all only
+# creates missing tables, so these are added with ALTER TABLE
+ADDED_COLUMNS = {"users": ["version", "updated_at"]}
+
+def add_missing_columns():
+    inspector = inspect(engine)
+    for table_name, names in ADDED_COLUMNS.items():
+        existing = {c["name"] for c in inspector.get_columns(table_name)}
+        table = Base.metadata.tables[table_name]
+        for name in names:
+            if name in existing:
+                continue
+            column = table.c[name]
+            ddl = f"ALTER TABLE {table_name} ADD COLUMN {name} {column.type.compile(engine.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            print(f"✅ Added {table_name}.{name}")
+
+def add_missing_indexes():
+    """
+    create_all only builds indexes together with a new table, so indexes
+    declared later (e.g. ix_users_created_at_id) are created here. Indexes on
+    columns that do not exist yet belong to their own migration script.
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {i["name"] for i in inspector.get_indexes(table.name)}
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if index.name in existing or not {c.name for c in index.columns} <= columns:
+                continue
+            try:
+                index.create(bind=engine, checkfirst=True)
+                print(f"✅ Created index {index.name}")
+            except Exception as e:
+                print(f"❌ Could not create index {index.name}: {e}")
+
+def migrate_verification_codes():
+    """
+    Codes used to live in users.verification_code. Move the pending ones of
+    unverified users into verification_codes with a fresh TTL, so emails sent
+    before the upgrade still work, and clear the old column.
+    """
+    if "verification_code" not in {c["name"] for c in inspect(engine).get_columns("users")}:
+        return
+    with engine.begin() as conn:
+        pending = conn.execute(text(
+            "SELECT id, email, verification_code FROM users "
+            "WHERE verification_code IS NOT NULL AND (is_verified IS NULL OR is_verified = :false)"
+        ), {"false": False}).all()
+        existing = set(conn.scalars(select(VerificationCode.email_normalized)))
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=VERIFICATION_CODE_TTL_SECONDS)
+        rows = {}
+        for _, email, code in pending:
+            email = normalize_email(email)
+            if email not in existing:
+                rows[email] = {"email_normalized": email, "code_hash": hash_code(code), "attempts": 0,
+                               "expires_at": expires_at}
+        if rows:
+            conn.execute(insert(VerificationCode), list(rows.values()))
+        conn.execute(text("UPDATE users SET verification_code = NULL WHERE verification_code IS NOT NULL"))
+    if rows:
+        print(f"✅ Moved {len(rows)} pending verification codes to verification_codes")
 
 def init_database():
     """Create all tables"""
     try:
         Base.metadata.create_all(bind=engine)
+        add_missing_columns()
+        add_missing_indexes()
+        migrate_verification_codes()
         print("✅ Database tables created successfully!")
     except Exception as e:
         print(f"❌ Error creating database tables: {e}")
 
+# --- sources -----------------------------------------------------------------
+
+def parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+def generate_rows(count: int, domain: str, password: str, verified_ratio: float):
+    """Deterministic synthetic users, so a resumed run regenerates the same rows."""
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    step = 365 * 86400 / max(count, 1)
+    for i in range(count):
+        rng = random.Random(i)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{i}@{domain}",
+            "password": password,
+            "is_verified": rng.random() < verified_ratio,
+            "created_at": start + timedelta(seconds=i * step),
+        }
+
+def read_rows(path: str):
+    """Stream rows from a .csv or .ndjson/.jsonl file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def prepare(row: dict) -> dict:
+    if not (row.get("password") or row.get("password_hash")):
+        raise ValueError(f"Row for {row.get('email')!r} has neither password nor password_hash")
+    created_at = row.get("created_at")
+    if isinstance(created_at, str) and created_at:
+        created_at = datetime.fromisoformat(created_at)
+    return {
+        "name": row.get("name") or row["email"].split("@")[0],
+        "email": row["email"].strip(),
+        "email_normalized": normalize_email(row["email"]),
+        "password": row.get("password_hash") or None,
+        "plain_password": row.get("password"),
+        "is_verified": parse_bool(row.get("is_verified", False)),
+        "created_at": created_at or datetime.now(timezone.utc),
+    }
+
+# --- hashing -----------------------------------------------------------------
+
+def set_rounds(rounds: int):
+    # Runs in each worker process; hash_password reads the module setting
+    security.BCRYPT_ROUNDS = rounds
+
+class BatchHasher:
+    """
+    Hashes the plain passwords of a batch across worker processes, one hash
+    (and salt) per row. With share_hashes, rows with the same password reuse
+    one hash per batch; that is only acceptable for synthetic users, since
+    identical hashes reveal which accounts share a password.
+    """
+
+    def __init__(self, workers: int, rounds: int, share_hashes: bool = False):
+        self.workers = workers
+        self.share_hashes = share_hashes
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=set_rounds, initargs=(rounds,))
+        self.hashed_total = 0
+        self.seconds = 0.0
+
+    def submit(self, rows: list):
+        pending = [row["plain_password"] for row in rows if row["password"] is None]
+        if self.share_hashes:
+            pending = sorted(set(pending))
+        chunksize = max(1, len(pending) // (self.workers * 4))
+        return time.perf_counter(), pending, self.pool.map(security.hash_password, pending, chunksize=chunksize)
+
+    def apply(self, rows: list, submitted):
+        start, pending, results = submitted
+        if self.share_hashes:
+            hashes = dict(zip(pending, results))
+            for row in rows:
+                if row["password"] is None:
+                    row["password"] = hashes[row["plain_password"]]
+        else:
+            hashes = iter(results)
+            for row in rows:
+                if row["password"] is None:
+                    row["password"] = next(hashes)
+        self.hashed_total += len(pending)
+        self.seconds += time.perf_counter() - start
+        return rows
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+# --- inserting ---------------------------------------------------------------
+
+def copy_rows(conn, rows: list):
+    """Postgres COPY through the psycopg2 connection underneath SQLAlchemy."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row["created_at"].isoformat() if c == "created_at" else row[c] for c in COPY_COLUMNS])
+    buffer.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY users ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+def insert_rows(conn, rows: list, use_copy: bool):
+    if use_copy:
+        copy_rows(conn, rows)
+    else:
+        conn.execute(insert(User.__table__), [{c: row[c] for c in COPY_COLUMNS} for row in rows])
+
+def drop_existing(rows: list) -> list:
+    """Rows whose email is not in the table yet, de-duplicated within the batch."""
+    with engine.connect() as conn:
+        existing = set(conn.execute(
+            select(User.email_normalized).where(User.email_normalized.in_([r["email_normalized"] for r in rows]))
+        ).scalars())
+    fresh = {}
+    for row in rows:
+        if row["email_normalized"] not in existing:
+            fresh.setdefault(row["email_normalized"], row)
+    return list(fresh.values())
+
+def write_batch(rows: list, use_copy: bool) -> int:
+    """Insert one batch in its own transaction. Returns rows inserted."""
+    try:
+        with engine.begin() as conn:
+            insert_rows(conn, rows, use_copy)
+        return len(rows)
+    except (IntegrityError, engine.dialect.dbapi.IntegrityError):
+        # COPY raises the driver's error directly, not SQLAlchemy's wrapper.
+        # Already imported (a resumed batch) or duplicated in the source
+        rows = drop_existing(rows)
+        if rows:
+            with engine.begin() as conn:
+                insert_rows(conn, rows, use_copy)
+        return len(rows)
+
+# --- progress ----------------------------------------------------------------
+
+def load_offset(state_file: str) -> int:
+    try:
+        with open(state_file) as f:
+            return json.load(f)["offset"]
+    except FileNotFoundError:
+        return 0
+
+def save_offset(state_file: str, offset: int):
+    tmp = f"{state_file}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"offset": offset, "updated_at": datetime.now(timezone.utc).isoformat()}, f)
+    os.replace(tmp, state_file)
+
+def batched(rows, size: int):
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+def bulk_load(rows, state_file: str, resume: bool, batch_size: int, workers: int, rounds: int,
+              share_hashes: bool = False):
+    Base.metadata.create_all(bind=engine)
+    use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+    offset = load_offset(state_file) if resume else 0
+    if offset:
+        print(f"↪️  Resuming after {offset} rows")
+
+    hasher = BatchHasher(workers, rounds, share_hashes)
+    batches = batched(map(prepare, itertools.islice(rows, offset, None)), batch_size)
+    inserted = 0
+    start = time.perf_counter()
+    print(f"🚀 Loading users with {'COPY' if use_copy else 'executemany'}, {workers} hashing workers, "
+          f"bcrypt rounds={rounds}")
+    if share_hashes:
+        print("ℹ️  Rows with the same password share one hash per batch, so rows/sec leaves out most of the "
+              "hashing a real import does")
+    try:
+        current = next(batches, None)
+        pending = hasher.submit(current) if current else None
+        while current:
+            rows_ready = hasher.apply(current, pending)
+            # Hash the next batch while this one is written
+            current = next(batches, None)
+            pending = hasher.submit(current) if current else None
+
+            inserted += write_batch(rows_ready, use_copy)
+            offset += len(rows_ready)
+            save_offset(state_file, offset)
+            elapsed = time.perf_counter() - start
+            print(f"  {offset} rows read, {inserted} inserted, {inserted / elapsed:.0f} rows/sec")
+    except KeyboardInterrupt:
+        print(f"⏸️  Interrupted after {offset} rows; re-run with --resume to continue")
+        raise SystemExit(130)
+    finally:
+        hasher.shutdown()
+
+    elapsed = time.perf_counter() - start
+    hash_rate = hasher.hashed_total / hasher.seconds if hasher.seconds else 0
+    print(f"✅ Inserted {inserted} users in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):.0f} rows/sec, "
+          f"{hasher.hashed_total} hashes at {hash_rate:.0f}/sec)")
+    return inserted
+
 if __name__ == "__main__":
-    init_database()
+    parser = argparse.ArgumentParser(description="Create tables and seed or import users")
+    commands = parser.add_subparsers(dest="command")
+
+    def add_load_options(sub, default_state):
+        sub.add_argument("--batch-size", type=int, default=5000)
+        sub.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        sub.add_argument("--rounds", type=int, default=security.BCRYPT_ROUNDS,
+                         help="bcrypt cost; lower rounds are upgraded on each user's next login")
+        sub.add_argument("--state-file", default=default_state)
+        sub.add_argument("--resume", action="store_true", help="continue from the state file")
+
+    generate = commands.add_parser("generate", help="insert synthetic users")
+    generate.add_argument("--count", type=int, required=True)
+    generate.add_argument("--domain", default="seed.jobvision.ai")
+    generate.add_argument("--password", default="Password123!", help="shared plain password for every user")
+    generate.add_argument("--verified-ratio", type=float, default=0.8)
+    add_load_options(generate, None)
 
+    load = commands.add_parser("import", help="import users from a .csv or .ndjson file")
+    load.add_argument("path")
+    add_load_options(load, None)
 
+    args = parser.parse_args()
+    if args.command == "generate":
+        rows = generate_rows(args.count, args.domain, args.password, args.verified_ratio)
+        state_file = args.state_file or f"seed-{args.domain}-{args.count}.progress.json"
+        # Every generated user has the same password: hash it once per batch
+        bulk_load(rows, state_file, args.resume, args.batch_size, args.workers, args.rounds, share_hashes=True)
+    elif args.command == "import":
+        state_file = args.state_file or f"{args.path}.progress.json"
+        bulk_load(read_rows(args.path), state_file, args.resume, args.batch_size, args.workers, args.rounds)
+    else:
+        init_database()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Production entry point: several uvicorn worker processes on one socket.
+
+    python serve.py                          # WEB_CONCURRENCY, else one worker per core
+    python serve.py --workers 4 --port 8000
+
+uvicorn's supervisor starts the workers and replaces any that die. On
+SIGTERM/SIGINT each worker closes its listening socket, gives in-flight
+requests up to GRACEFUL_TIMEOUT seconds to finish, then runs the app
+lifespan shutdown: the outbox worker and hashing pool stop, and the
+worker's DB pools are disposed. Nothing is served once SIGTERM arrives, so
+/health/ready cannot announce the shutdown: remove the instance from the
+load balancer (e.g. a preStop delay) before signalling it.
+
+Workers share no memory. Set SHARED_STATE_URL (app/utils/shared_state.py)
+so rate limits, refresh-token revocation and the profile cache agree
+across them. Every worker also opens its own DB pool: keep
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the database's connection
+limit. Likewise every worker has its own bcrypt process pool; unless
+PASSWORD_HASH_WORKERS is set, it is sized to cores // workers so the host
+runs about one hashing process per core, and the hasher's admission cap
+(which scales with it) still bounds CPU across the whole host.
+
+Prometheus metrics live in each worker's memory, so with more than one
+worker serve.py points PROMETHEUS_MULTIPROC_DIR at a fresh directory
+(default: a per-port temp dir) and /metrics reports totals across workers.
+"""
+import argparse
+import glob
+import os
+import tempfile
+import uvicorn
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", 0)) or os.cpu_count() or 1
+
+def hash_workers_per_worker(workers: int) -> int:
+    # Split the cores between the web workers' bcrypt pools instead of
+    # giving each of them a pool as large as the machine
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def prepare_metrics_dir(workers: int, port: int):
+    """Multiprocess mode for prometheus_client; must be set before workers import it."""
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not path and workers <= 1:
+        return
+    path = path or os.path.join(tempfile.gettempdir(), f"jobvision-metrics-{port}")
+    os.makedirs(path, exist_ok=True)
+    # Files left by a previous run would be added to this run's totals
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the backend with multiple worker processes")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+                        help="seconds in-flight requests get to finish on shutdown")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    args = parser.parse_args()
+
+    if args.workers > 1 and not os.getenv("SHARED_STATE_URL"):
+        print("⚠️  SHARED_STATE_URL is not set: rate limits, revocations and caches are per worker")
+    prepare_metrics_dir(args.workers, args.port)
+    # Inherited by the worker processes, which read it at import
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", str(hash_workers_per_worker(args.workers)))
+    print(f"🚀 Starting {args.workers} worker(s) on {args.host}:{args.port}, "
+          f"{os.environ['PASSWORD_HASH_WORKERS']} hashing process(es) each")
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=args.log_level,
+    )